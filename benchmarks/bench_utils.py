@@ -0,0 +1,48 @@
+"""Shared helpers for the benchmark scripts."""
+import os, sys, json, shutil, tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "src"))
+
+SAMPLE_ICON = os.path.join(REPO_DIR, "icons", "System_Mute.png")
+
+def synthetic_hotkeys(icon_count, prefix="Icon", state=True, first_combo=0):
+    """Return hotkeys.json-style data with the given number of icons."""
+    hotkeys = {"System Mute": ["Ctrl", "Shift", "A", False]}
+    for i in range(icon_count):
+        combo = first_combo + i
+        hotkeys[f"{prefix} {i}"] = ["Ctrl", "Alt", f"F{combo % 24 + 1}", str(combo), state]
+    return hotkeys
+
+def prepare_data_dir(hotkeys, profiles=None):
+    """Create and enter a temporary working directory with the given icon sets."""
+    work_dir = tempfile.mkdtemp(prefix="overlay_bench_")
+    os.makedirs(os.path.join(work_dir, "data", "profiles"))
+    os.makedirs(os.path.join(work_dir, "icons"))
+
+    with open(os.path.join(work_dir, "data", "hotkeys.json"), "w") as f:
+        json.dump(hotkeys, f)
+    for name, profile_hotkeys in (profiles or {}).items():
+        with open(os.path.join(work_dir, "data", "profiles", f"{name}.json"), "w") as f:
+            json.dump(profile_hotkeys, f)
+
+    from icon_import import save_icon_image
+    sample_icon = os.path.join(work_dir, "sample.png")
+    save_icon_image(SAMPLE_ICON, sample_icon)
+
+    icons_dirs = {os.path.join(work_dir, "icons"): hotkeys}
+    for name, profile_hotkeys in (profiles or {}).items():
+        icons_dirs[os.path.join(work_dir, "icons", name)] = profile_hotkeys
+    for icons_dir, icon_names in icons_dirs.items():
+        os.makedirs(icons_dir, exist_ok=True)
+        for icon_name in icon_names:
+            shutil.copy(sample_icon, os.path.join(icons_dir, icon_name.replace(" ", "_") + ".png"))
+
+    os.chdir(work_dir)
+    return work_dir
+
+def cleanup_data_dir(work_dir):
+    """Leave and remove a temporary working directory."""
+    os.chdir(REPO_DIR)
+    shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,136 @@
+"""Compare memory and per-keystroke CPU of standalone overlays with overlays sharing the daemon."""
+import os, sys, json, time, socket, random, argparse, subprocess
+import psutil
+from bench_utils import REPO_DIR, prepare_data_dir, cleanup_data_dir, synthetic_hotkeys
+from hotkey_index import normalize_combo, format_combo
+from overlay_daemon import read_endpoint
+
+ICON_COUNT = 30
+KEYSTROKES = 200
+KEYSTROKE_INTERVAL = 0.005
+CLIENT_SCRIPT = """
+import sys
+if sys.argv[1] == "standalone":
+    import keyboard
+from PyQt5.QtWidgets import QApplication
+import overlay
+app = QApplication(sys.argv)
+icon_overlay = overlay.IconOverlay(hooks=sys.argv[1] == "daemon")
+icon_overlay.show()
+print("ready", flush=True)
+sys.exit(app.exec_())
+"""
+
+def start_process(args, cwd, env, ready_text):
+    """Start a process and wait until it prints a line containing the ready text."""
+    process = subprocess.Popen([sys.executable] + args, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    while ready_text not in process.stdout.readline():
+        if process.poll() is not None:
+            raise RuntimeError(f"{args[0]} exited before it was ready")
+    return process
+
+def memory(processes):
+    """Return the summed RSS and proportional set size (USS where unavailable) of processes in MB."""
+    infos = [psutil.Process(process.pid).memory_full_info() for process in processes]
+    return sum(info.rss for info in infos) / 2**20, sum(getattr(info, "pss", info.uss) for info in infos) / 2**20
+
+def cpu_seconds(processes):
+    """Return the summed user and system CPU time of processes."""
+    return sum(sum(psutil.Process(process.pid).cpu_times()[:2]) for process in processes)
+
+def connect(endpoint_file, token=None):
+    """Connect to the daemon with a hello and return the connection and the daemon's reply."""
+    port, daemon_token = read_endpoint(endpoint_file)
+    connection = socket.create_connection(("127.0.0.1", port))
+    connection.sendall(json.dumps({"type": "hello", "token": token or daemon_token, "combos": []}).encode("utf-8") + b"\n")
+    return connection, json.loads(connection.makefile("rb").readline())
+
+def rejects_wrong_token(endpoint_file):
+    """Check that the daemon answers a hello with a wrong token with an error and closes the connection."""
+    connection, reply = connect(endpoint_file, token="0" * 32)
+    closed = connection.recv(1) == b""
+    connection.close()
+    return reply.get("type") == "error" and closed
+
+def keystroke_cpu(processes, combos, endpoint_file):
+    """Return the CPU milliseconds all processes spend per forwarded keystroke, minus idle CPU."""
+    connection, _ = connect(endpoint_file)
+    duration = len(combos) * KEYSTROKE_INTERVAL + 0.5
+
+    start = cpu_seconds(processes)
+    time.sleep(duration)
+    idle = cpu_seconds(processes) - start
+
+    start = cpu_seconds(processes)
+    for combo in combos:
+        connection.sendall(json.dumps({"type": "trigger", "combo": combo}).encode("utf-8") + b"\n")
+        time.sleep(KEYSTROKE_INTERVAL)
+    time.sleep(0.5)
+    busy = cpu_seconds(processes) - start
+    connection.close()
+    return max(busy - idle, 0) * 1000 / len(combos)
+
+def run(client_count, mode, client_dirs, env):
+    """Start overlays in one mode and measure them."""
+    endpoint_file = os.path.join(client_dirs[0], "daemon", "endpoint.json")
+    for client_dir in client_dirs:
+        with open(os.path.join(client_dir, "data", "overlay_settings.json"), "w") as f:
+            json.dump({"overlay_location": "Top Right", "icon_size": 44, "control_port": 0, "toggle_history": False,
+                       "daemon": mode == "daemon", "daemon_endpoint": endpoint_file}, f)
+
+    processes = []
+    try:
+        if mode == "daemon":
+            processes.append(start_process([os.path.join(REPO_DIR, "src", "overlay_daemon.py"), "--endpoint", endpoint_file, "--no-hooks"], REPO_DIR, env, "listening"))
+        for client_dir in client_dirs[:client_count]:
+            processes.append(start_process(["-c", CLIENT_SCRIPT, mode], client_dir, env, "ready"))
+        time.sleep(1)
+        result = {"memory": memory(processes)}
+
+        if mode == "daemon":
+            own_combos = [format_combo(normalize_combo(["Ctrl", "Alt", f"F{combo % 24 + 1}", str(combo)]), "+")
+                          for combo in (random.randrange(client_count) * ICON_COUNT + random.randrange(ICON_COUNT) for _ in range(KEYSTROKES))]
+            result["own_combo_cpu"] = keystroke_cpu(processes, own_combos, endpoint_file)
+            result["shared_combo_cpu"] = keystroke_cpu(processes, [format_combo(normalize_combo(["Ctrl", "Shift", "A"]), "+")] * KEYSTROKES, endpoint_file)
+            result["rejected"] = rejects_wrong_token(endpoint_file)
+        return result
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+def main():
+    """Measure overlays for every client count in both modes."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    random.seed(0)
+
+    client_dirs = []
+    for i in range(max(args.clients)):
+        client_dirs.append(prepare_data_dir(synthetic_hotkeys(ICON_COUNT, first_combo=i * ICON_COUNT)))
+    os.chdir(REPO_DIR)
+    env = dict(os.environ, PYTHONPATH=os.path.join(REPO_DIR, "src"))
+
+    print(f"{'Clients':>7}  {'Standalone RSS/PSS MB':>22}  {'Daemon RSS/PSS MB':>22}  {'Own combo ms':>12}  {'Shared combo ms':>15}  {'Wrong token':>11}")
+    results = {}
+    for client_count in args.clients:
+        standalone = run(client_count, "standalone", client_dirs, env)
+        daemon = run(client_count, "daemon", client_dirs, env)
+        results[client_count] = (standalone, daemon)
+        print(f"{client_count:>7}  {standalone['memory'][0]:>10.1f} / {standalone['memory'][1]:>9.1f}  {daemon['memory'][0]:>10.1f} / {daemon['memory'][1]:>9.1f}"
+              f"  {daemon['own_combo_cpu']:>12.3f}  {daemon['shared_combo_cpu']:>15.3f}  {'rejected' if daemon['rejected'] else 'ACCEPTED':>11}")
+
+    first, last = min(results), max(results)
+    if last > first:
+        added = last - first
+        print(f"Cost per added client: standalone +{(results[last][0]['memory'][1] - results[first][0]['memory'][1]) / added:.1f} MB PSS, "
+              f"daemon +{(results[last][1]['memory'][1] - results[first][1]['memory'][1]) / added:.1f} MB PSS, "
+              f"own combo +{(results[last][1]['own_combo_cpu'] - results[first][1]['own_combo_cpu']) / added:.3f} ms, "
+              f"shared combo +{(results[last][1]['shared_combo_cpu'] - results[first][1]['shared_combo_cpu']) / added:.3f} ms")
+
+    for client_dir in client_dirs:
+        cleanup_data_dir(client_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark status feed fan-out to many concurrent Server-Sent Events subscribers running in separate processes."""
+import os, sys, json, time, asyncio, argparse, subprocess
+import bench_utils
+from status_feed import StatusFeed
+
+PORT = 48299
+SUBSCRIBERS = 300
+PROCESSES = 6
+MESSAGES = 200
+PUBLISH_INTERVAL = 0.01
+
+async def subscriber(result):
+    """Connect to the event stream and record how late each state event arrives, until the last one."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", PORT)
+    writer.write(b"GET /events HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    await writer.drain()
+    await reader.readuntil(b"\r\n\r\n")
+    states = {}
+    while not states.get("last"):
+        event = await reader.readuntil(b"\n\n")
+        kind, _, data = event.partition(b"\ndata: ")
+        if kind == b"event: state":
+            data = json.loads(data)
+            result["latencies"].append((time.perf_counter() - data["sent"]) * 1000)
+            states.update(data)
+        elif kind == b"event: snapshot":
+            result["snapshots"] += 1
+            states.update(json.loads(data))
+    result["consistent"] += states["System Mute"] == bool((MESSAGES - 1) % 2)
+    writer.close()
+
+async def worker(count):
+    """Run subscribers in this process, reporting readiness and then their results on stdout."""
+    result = {"latencies": [], "snapshots": 0, "consistent": 0}
+    tasks = [asyncio.create_task(subscriber(result)) for _ in range(count)]
+    print("ready", flush=True)
+    await asyncio.gather(*tasks)
+    print(json.dumps(result), flush=True)
+
+def fetch(path, headers=""):
+    """Return the status line, headers and body of a GET request."""
+    import socket
+    with socket.create_connection(("127.0.0.1", PORT)) as connection:
+        connection.sendall(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n{headers}\r\n".encode("latin-1"))
+        response = b""
+        while chunk := connection.recv(65536):
+            response += chunk
+    head, _, body = response.partition(b"\r\n\r\n")
+    return head.decode("latin-1"), body
+
+def main():
+    """Start subscriber processes, publish changes and report delivery latency and server cost."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=SUBSCRIBERS)
+    parser.add_argument("--processes", type=int, default=PROCESSES)
+    parser.add_argument("--interval", type=float, default=PUBLISH_INTERVAL, help="Seconds between published changes")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        asyncio.run(worker(args.worker))
+        return
+
+    feed = StatusFeed(port=PORT)
+    with open(bench_utils.SAMPLE_ICON, "rb") as f:
+        feed.set_icon_sets({"Default": [{"name": "System Mute", "hotkey": "Ctrl + Shift + A", "image": "/icons/System%20Mute.png"}]}, {"System Mute": f.read()})
+    feed.activate("Default", {"System Mute": False})
+    feed.start()
+
+    counts = [args.subscribers // args.processes + (i < args.subscribers % args.processes) for i in range(args.processes)]
+    workers = [subprocess.Popen([sys.executable, __file__, "--worker", str(count)], stdout=subprocess.PIPE, text=True) for count in counts if count]
+    for process in workers:
+        process.stdout.readline()
+    while len(feed.subscribers) < args.subscribers:
+        time.sleep(0.05)
+    connected = json.loads(fetch("/stats")[1])["subscribers"]
+
+    start = time.perf_counter()
+    start_cpu = sum(os.times()[:2])
+    for i in range(MESSAGES):
+        feed.publish({"System Mute": bool(i % 2), "sent": time.perf_counter(), "last": i == MESSAGES - 1})
+        time.sleep(args.interval)
+    results = [json.loads(process.stdout.readline()) for process in workers]
+    server_cpu = sum(os.times()[:2]) - start_cpu
+    elapsed = time.perf_counter() - start
+    for process in workers:
+        process.wait()
+
+    stats = json.loads(fetch("/stats")[1])
+    head, body = fetch("/icons/System%20Mute.png")
+    etag = [line.split(": ", 1)[1] for line in head.split("\r\n") if line.lower().startswith("etag")][0]
+    cached_head, _ = fetch("/icons/System%20Mute.png", f"If-None-Match: {etag}\r\n")
+    feed.stop()
+
+    latencies = sorted(latency for result in results for latency in result["latencies"])
+    consistent = sum(result["consistent"] for result in results)
+    print(f"{args.subscribers} subscribers in {len(workers)} processes, {MESSAGES} messages every {args.interval * 1000:.0f} ms, "
+          f"{len(latencies) / elapsed:.0f} deliveries/s on {os.cpu_count()} CPUs")
+    print(f"Delivered {len(latencies)} of {args.subscribers * MESSAGES} state events, {stats['resyncs']} resyncs of slow subscribers, "
+          f"{consistent}/{args.subscribers} subscribers ended with the correct state")
+    print(f"Publish to subscriber: median {latencies[len(latencies) // 2]:.2f} ms, p95 {latencies[int(len(latencies) * 0.95)]:.2f} ms, max {latencies[-1]:.2f} ms")
+    print(f"Server fan-out per message: last {stats['last_fanout_ms']:.3f} ms, max {stats['max_fanout_ms']:.3f} ms, {connected} subscribers connected")
+    print(f"Server CPU: {server_cpu * 1e6 / (args.subscribers * MESSAGES):.1f} us per delivery, {server_cpu * 1000 / MESSAGES:.2f} ms per message")
+    print(f"Icon image: {len(body)} bytes, conditional request -> {cached_head.splitlines()[0]}")
+
+if __name__ == "__main__":
+    main()
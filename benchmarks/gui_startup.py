@@ -0,0 +1,72 @@
+"""Time the GUI from launch to interactive and fail if it exceeds the startup budget."""
+import os, sys, json, time, shutil, argparse, statistics, subprocess
+from bench_utils import REPO_DIR, prepare_data_dir, cleanup_data_dir, synthetic_hotkeys
+
+ICON_COUNT = 50
+RUNS = 10
+IMPORT_BUDGET_MS = 60
+INTERACTIVE_BUDGET_MS = 500
+IMPORT_SCRIPT = "import time; start = time.perf_counter(); import overlay_gui; print((time.perf_counter() - start) * 1000)"
+
+def launch(args, env):
+    """Run a GUI process and return its wall time in milliseconds and its last output line."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable] + args, env=env, capture_output=True, text=True, timeout=60)
+    elapsed = (time.perf_counter() - start) * 1000
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        return elapsed, None, result.stderr.strip().splitlines()[-1:] or ["no output"]
+    return elapsed, lines[-1], None
+
+def main():
+    """Launch the GUI repeatedly and compare median timings with the budgets."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=RUNS)
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET_MS, help="Maximum median ms to import overlay_gui")
+    parser.add_argument("--budget", type=float, default=INTERACTIVE_BUDGET_MS, help="Maximum median ms from launch to interactive")
+    args = parser.parse_args()
+
+    work_dir = prepare_data_dir(synthetic_hotkeys(ICON_COUNT))
+    shutil.copytree(os.path.join(REPO_DIR, "assets"), os.path.join(work_dir, "assets"))
+    env = dict(os.environ, PYTHONPATH=os.path.join(REPO_DIR, "src"))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    gui_script = os.path.join(REPO_DIR, "src", "overlay_gui.py")
+    failures = []
+
+    launch(["-c", IMPORT_SCRIPT], env)
+    import_times = [float(launch(["-c", IMPORT_SCRIPT], env)[1]) for _ in range(args.runs)]
+    import_median = statistics.median(import_times)
+    print(f"Import overlay_gui:       median {import_median:7.1f} ms (budget {args.import_budget:.0f} ms)")
+    if import_median > args.import_budget:
+        failures.append("import")
+
+    first_launch, report, error = launch([gui_script, "--startup-report"], env)
+    if error:
+        print(f"Launch to interactive:    skipped, the GUI could not start here: {error[0]}")
+    else:
+        print(f"First launch:             {first_launch:7.1f} ms (renders the placeholder cache)")
+        totals = []
+        phases = {}
+        for _ in range(args.runs):
+            launched = time.time()
+            elapsed, report, error = launch([gui_script, "--startup-report"], env)
+            if error:
+                sys.exit(f"GUI launch failed: {error[0]}")
+            report = json.loads(report)
+            totals.append((report.pop("time") - launched) * 1000)
+            for phase, duration in report.items():
+                phases.setdefault(phase, []).append(duration)
+        total_median = statistics.median(totals)
+        for phase, durations in phases.items():
+            print(f"  {phase:<24}median {statistics.median(durations):7.1f} ms")
+        print(f"Launch to interactive:    median {total_median:7.1f} ms (budget {args.budget:.0f} ms), interpreter and imports {total_median - sum(statistics.median(d) for d in phases.values()):.1f} ms")
+        if total_median > args.budget:
+            failures.append("launch to interactive")
+
+    cleanup_data_dir(work_dir)
+    if failures:
+        print("Over budget: " + ", ".join(failures))
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
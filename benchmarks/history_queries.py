@@ -0,0 +1,44 @@
+"""Benchmark toggle history queries over a year of synthetic toggles."""
+import os, time, random, shutil, tempfile
+import bench_utils
+import toggle_history
+
+ICON_COUNT = 10
+TOGGLES_PER_DAY = 400
+DAYS = 365
+
+def main():
+    """Write a year of toggles, then time muted time queries over several ranges."""
+    directory = tempfile.mkdtemp(prefix="toggle_history_bench_")
+    random.seed(0)
+    history = toggle_history.ToggleHistory(directory)
+    states = {f"Icon {i}": False for i in range(ICON_COUNT)}
+    end = time.time_ns()
+    timestamp = end - DAYS * 86400 * 10**9
+
+    start = time.perf_counter()
+    for day in range(DAYS):
+        for _ in range(TOGGLES_PER_DAY):
+            timestamp += random.randint(1, 2 * 86400 * 10**9 // TOGGLES_PER_DAY)
+            icon_name = random.choice(list(states))
+            states[icon_name] = not states[icon_name]
+            history.record(icon_name, states[icon_name], timestamp=timestamp)
+        history.flush()
+    history.close()
+    elapsed = time.perf_counter() - start
+
+    segments = toggle_history.list_segments(directory)
+    size = sum(os.path.getsize(os.path.join(directory, file)) for file in os.listdir(directory))
+    print(f"Wrote {DAYS * TOGGLES_PER_DAY} toggles in {elapsed:.2f} s ({size / 1e6:.1f} MB, {len(segments)} segments)")
+
+    for description, days in [("last day", 1), ("last week", 7), ("last 30 days", 30), ("whole year", DAYS)]:
+        start = time.perf_counter()
+        summary = toggle_history.muted_time(end - days * 86400 * 10**9, end, directory)
+        elapsed = (time.perf_counter() - start) * 1000
+        total_hours = sum(seconds for seconds, toggles in summary.values()) / 3600
+        print(f"Muted time for the {description:<13} {elapsed:7.2f} ms ({total_hours:.1f} icon-hours)")
+
+    shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Measure loopback publish-to-repaint latency and packet rate of LAN state mirroring."""
+import sys, json, time, random
+from bench_utils import prepare_data_dir, cleanup_data_dir, synthetic_hotkeys
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
+
+ICON_COUNT = 20
+MIRROR = {"mode": "subscribe", "group": "127.0.0.1", "port": 48299, "hotkeys": False}
+STORM_SECONDS = 3
+BURST_SIZE = 10
+
+def main():
+    """Publish a toggle storm over loopback and time when the subscriber repaints it."""
+    hotkeys = synthetic_hotkeys(ICON_COUNT)
+    work_dir = prepare_data_dir(hotkeys)
+    with open("data/overlay_settings.json", "w") as f:
+        json.dump({"overlay_location": "Top Right", "icon_size": 45, "toggle_history": False, "mirror": MIRROR}, f)
+
+    app = QApplication(sys.argv)
+    import overlay, state_mirror
+
+    icon_overlay = overlay.IconOverlay(hooks=False)
+    states = {name: state[-1] for name, state in hotkeys.items()}
+    publisher = state_mirror.StatePublisher(lambda: dict(states), MIRROR["group"], MIRROR["port"])
+
+    sent_times = []
+    latencies = []
+    render_frame = icon_overlay.scheduler.render_frame
+
+    def timed_render_frame():
+        render_frame()
+        now = time.time()
+        latencies.extend((now - sent) * 1000 for sent in sent_times)
+        sent_times.clear()
+
+    icon_overlay.scheduler.frame_timer.timeout.disconnect()
+    icon_overlay.scheduler.frame_timer.timeout.connect(timed_render_frame)
+
+    toggles = 0
+    deadline = time.time() + STORM_SECONDS
+
+    def storm():
+        nonlocal toggles
+        if time.time() > deadline:
+            QTimer.singleShot(200, app.quit)
+            return
+        burst = {}
+        for name in random.sample([name for name in states if name != "System Mute"], BURST_SIZE):
+            states[name] = not states[name]
+            burst[name] = states[name]
+        toggles += len(burst)
+        publisher.publish(burst)
+        sent_times.append(time.time())
+        QTimer.singleShot(1, storm)
+
+    QTimer.singleShot(100, storm)
+    app.exec_()
+
+    latencies.sort()
+    received = icon_overlay.subscriber.stats
+    print(f"Toggles published: {toggles / STORM_SECONDS:.0f}/s in {publisher.stats['datagrams'] / STORM_SECONDS:.0f} datagrams/s ({publisher.stats['bytes'] / STORM_SECONDS / 1024:.1f} KiB/s)")
+    print(f"Datagrams received: {received['datagrams']}, lost: {received['lost']}, stale: {received['stale']}")
+    if latencies:
+        print(f"Publish to repaint: median {latencies[len(latencies) // 2]:.1f} ms, p95 {latencies[int(len(latencies) * 0.95)]:.1f} ms, max {latencies[-1]:.1f} ms")
+    mismatched = [name for name in states if icon_overlay.icon_states[name] != states[name] and name != "System Mute"]
+    print(f"Icons out of sync after the storm: {len(mismatched)}")
+    cleanup_data_dir(work_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Exercise multi-monitor overlay layouts headlessly with virtual screens."""
+import sys, json, time
+from bench_utils import prepare_data_dir, cleanup_data_dir, synthetic_hotkeys
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QRect, pyqtSignal
+
+ICON_COUNT = 40
+
+class VirtualScreen(QObject):
+    """Stand in for a QScreen with a settable geometry and device pixel ratio."""
+
+    geometryChanged = pyqtSignal(QRect)
+    availableGeometryChanged = pyqtSignal(QRect)
+    logicalDotsPerInchChanged = pyqtSignal(float)
+
+    def __init__(self, name, geometry, device_pixel_ratio=1.0):
+        """Initialize the virtual screen."""
+        super().__init__()
+        self.screen_name = name
+        self.screen_geometry = geometry
+        self.ratio = device_pixel_ratio
+
+    def name(self):
+        """Return the screen name."""
+        return self.screen_name
+
+    def geometry(self):
+        """Return the screen geometry."""
+        return self.screen_geometry
+
+    def devicePixelRatio(self):
+        """Return the device pixel ratio."""
+        return self.ratio
+
+    def set_geometry(self, geometry):
+        """Change the geometry as a resolution change would."""
+        self.screen_geometry = geometry
+        self.geometryChanged.emit(geometry)
+
+    def set_device_pixel_ratio(self, device_pixel_ratio):
+        """Change the device pixel ratio as a scaling change would."""
+        self.ratio = device_pixel_ratio
+        self.logicalDotsPerInchChanged.emit(96 * device_pixel_ratio)
+
+def icon_position(icon_overlay, icon_name):
+    """Return the global position of an icon."""
+    icon = icon_overlay.icons[icon_name]
+    return icon.x() + icon_overlay.x(), icon.y() + icon_overlay.y()
+
+def step(icon_overlay, description, action):
+    """Run a screen change and report the layout work it caused."""
+    before = dict(icon_overlay.layout_stats)
+    start = time.perf_counter()
+    action()
+    elapsed = (time.perf_counter() - start) * 1000
+    work = {key: icon_overlay.layout_stats[key] - before[key] for key in before}
+    print(f"{description:<32} {elapsed:6.2f} ms  {work}  Stream 0 at {icon_position(icon_overlay, 'Stream 0')}, Icon 0 at {icon_position(icon_overlay, 'Icon 0')}")
+
+def main():
+    """Add, resize, rescale and remove a virtual second screen."""
+    hotkeys = synthetic_hotkeys(ICON_COUNT)
+    hotkeys.update({name: keys for name, keys in synthetic_hotkeys(ICON_COUNT, prefix="Stream", first_combo=ICON_COUNT).items() if name != "System Mute"})
+    work_dir = prepare_data_dir(hotkeys)
+    with open("data/overlay_settings.json", "w") as f:
+        json.dump({
+            "overlay_location": "Top Right",
+            "icon_size": 45,
+            "icon_groups": {"Stream": {"icons": [f"Stream {i}" for i in range(ICON_COUNT)], "screen": "Virtual 2", "location": "Bottom Left"}},
+        }, f)
+
+    app = QApplication(sys.argv)
+    import overlay
+    icon_overlay = overlay.IconOverlay(hooks=False)
+    print(f"Overlay geometry: {icon_overlay.geometry()}")
+
+    second_screen = VirtualScreen("Virtual 2", QRect(1920, 0, 1920, 1080))
+    step(icon_overlay, "Add second screen", lambda: icon_overlay.on_screen_added(second_screen))
+    step(icon_overlay, "Change second screen resolution", lambda: second_screen.set_geometry(QRect(1920, 0, 2560, 1440)))
+    step(icon_overlay, "Change second screen scaling", lambda: second_screen.set_device_pixel_ratio(1.5))
+    step(icon_overlay, "Revert second screen resolution", lambda: second_screen.set_geometry(QRect(1920, 0, 1920, 1080)))
+    step(icon_overlay, "Remove second screen", lambda: icon_overlay.on_screen_removed(second_screen))
+    cleanup_data_dir(work_dir)
+
+if __name__ == "__main__":
+    main()
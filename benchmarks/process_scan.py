@@ -0,0 +1,93 @@
+"""Measure CPU per scan of the incremental process watcher against full process table scans."""
+import time, random, argparse
+import psutil
+import bench_utils
+from process_watcher import ProcessWatcher, process_key
+
+PROCESS_COUNTS = [1000, 5000, 20000]
+SCANS = 50
+CHURN = 0.005
+WATCHED = ["Discord.exe", "ms-teams.exe", "obs64.exe"]
+NAMES = ["svchost.exe", "chrome.exe", "explorer.exe", "RuntimeBroker.exe", "conhost.exe", "python.exe"] + WATCHED
+
+class SyntheticWatcher(ProcessWatcher):
+    """Watch a synthetic process table, paying for a real psutil name lookup per new process ID."""
+
+    def __init__(self, table, real_pids):
+        """Initialize the watcher over a dict of synthetic process IDs to names."""
+        super().__init__(WATCHED, parent=None)
+        self.table = table
+        self.real_pids = real_pids
+
+    def lookup(self, pid):
+        """Return the synthetic name after reading the name of a real process."""
+        self.stats["lookups"] += 1
+        try:
+            psutil.Process(self.real_pids[pid % len(self.real_pids)]).name()
+        except psutil.Error:
+            pass
+        return process_key(self.table[pid])
+
+def churn(table, next_pid):
+    """Replace a fraction of the synthetic processes with new ones, returning the next free process ID."""
+    for pid in random.sample(list(table), max(1, int(len(table) * CHURN))):
+        del table[pid]
+        table[next_pid] = random.choice(NAMES)
+        next_pid += 1
+    return next_pid
+
+def full_scan(table, real_pids):
+    """Look up every process name as a process_iter name scan would, returning the running watched names."""
+    watched = {process_key(name) for name in WATCHED}
+    running = set()
+    for pid, name in table.items():
+        try:
+            psutil.Process(real_pids[pid % len(real_pids)]).name()
+        except psutil.Error:
+            pass
+        if process_key(name) in watched:
+            running.add(process_key(name))
+    return running
+
+def main():
+    """Compare incremental and full scans over growing synthetic process tables and this system."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, nargs="+", default=PROCESS_COUNTS)
+    parser.add_argument("--scans", type=int, default=SCANS)
+    args = parser.parse_args()
+    random.seed(0)
+    real_pids = psutil.pids()
+
+    print(f"{'Processes':>9}  {'Incremental ms/scan':>19}  {'Lookups/scan':>12}  {'Full scan ms/scan':>17}")
+    for process_count in args.processes:
+        table = {pid: random.choice(NAMES) for pid in range(process_count)}
+        next_pid = process_count
+        watcher = SyntheticWatcher(table, real_pids)
+        watcher.scan(set(table))
+        watcher.stats.update(cpu_ms=0.0, lookups=0)
+
+        full_cpu = 0.0
+        for _ in range(args.scans):
+            next_pid = churn(table, next_pid)
+            watcher.scan(set(table))
+            start = time.thread_time()
+            full_scan(table, real_pids)
+            full_cpu += (time.thread_time() - start) * 1000
+
+        print(f"{process_count:>9}  {watcher.stats['cpu_ms'] / args.scans:>19.3f}  {watcher.stats['lookups'] / args.scans:>12.1f}  {full_cpu / args.scans:>17.3f}")
+
+    watcher = ProcessWatcher(WATCHED)
+    watcher.scan()
+    watcher.stats.update(cpu_ms=0.0)
+    start = time.thread_time()
+    for _ in range(args.scans):
+        watcher.scan()
+    incremental = (time.thread_time() - start) * 1000 / args.scans
+    start = time.thread_time()
+    for _ in range(args.scans):
+        [process.info["name"] for process in psutil.process_iter(["name"])]
+    full = (time.thread_time() - start) * 1000 / args.scans
+    print(f"This system ({len(psutil.pids())} processes): incremental {incremental:.3f} ms/scan, process_iter {full:.3f} ms/scan")
+
+if __name__ == "__main__":
+    main()
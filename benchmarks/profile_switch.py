@@ -0,0 +1,38 @@
+"""Benchmark hotkey profile switch latency with large profiles."""
+import sys, time
+from bench_utils import prepare_data_dir, cleanup_data_dir, synthetic_hotkeys
+
+from PyQt5.QtWidgets import QApplication
+
+PROFILE_COUNT = 5
+ICONS_PER_PROFILE = 300
+SWITCHES = 200
+
+def main():
+    """Time switch_profile plus the resulting repaint across all profiles."""
+    profiles = {f"Profile {p}": synthetic_hotkeys(ICONS_PER_PROFILE, prefix=f"P{p} Icon") for p in range(PROFILE_COUNT)}
+    work_dir = prepare_data_dir(synthetic_hotkeys(ICONS_PER_PROFILE), profiles)
+    app = QApplication(sys.argv)
+    import overlay
+
+    start = time.perf_counter()
+    icon_overlay = overlay.IconOverlay(hooks=False)
+    icon_overlay.save_active_profile = lambda: None
+    icon_overlay.show()
+    app.processEvents()
+    print(f"Prepared {len(icon_overlay.profiles)} profiles x {ICONS_PER_PROFILE} icons in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    names = list(icon_overlay.profiles)
+    latencies = []
+    for i in range(SWITCHES):
+        start = time.perf_counter()
+        icon_overlay.switch_profile(names[(i + 1) % len(names)])
+        app.processEvents()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    print(f"Switch latency: median {latencies[len(latencies) // 2]:.2f} ms, p95 {latencies[int(len(latencies) * 0.95)]:.2f} ms, max {latencies[-1]:.2f} ms")
+    cleanup_data_dir(work_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Measure paint work per toggle, burst coalescing and idle timer wakeups of the overlay render scheduler."""
+import sys
+from bench_utils import prepare_data_dir, cleanup_data_dir, synthetic_hotkeys
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt, QObject, QEvent, QTimer
+
+ICON_COUNT = 20
+TOGGLES = 200
+BURST_TOGGLES = 500
+IDLE_SECONDS = 5
+
+class EventCounter(QObject):
+    """Count paint events, repainted pixels and timer wakeups delivered to the overlay and its children."""
+
+    def __init__(self, overlay):
+        """Initialize the counters for an overlay."""
+        super().__init__()
+        self.overlay = overlay
+        self.reset()
+
+    def reset(self):
+        """Zero the counters."""
+        self.paints = 0
+        self.area = 0
+        self.timers = 0
+
+    def eventFilter(self, obj, event):
+        """Count events of interest sent to the overlay, ignoring the benchmark's own timers."""
+        if not self.owned(obj):
+            return False
+        if event.type() == QEvent.Paint:
+            self.paints += 1
+            self.area += sum(rect.width() * rect.height() for rect in event.region().rects())
+        elif event.type() == QEvent.Timer:
+            self.timers += 1
+        return False
+
+    def owned(self, obj):
+        """Check whether an object is the overlay or one of its descendants."""
+        while obj is not None:
+            if obj is self.overlay:
+                return True
+            obj = obj.parent()
+        return False
+
+def run(app, counter, action, seconds):
+    """Run an action, then let the event loop settle for the given duration."""
+    counter.reset()
+    action()
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec_()
+    return counter.paints, counter.area, counter.timers
+
+def spaced(app, toggle, names, spacing):
+    """Return an action that toggles each name in turn, one toggle every spacing milliseconds."""
+    pending = []
+    timer = QTimer(app)
+    timer.setTimerType(Qt.PreciseTimer)
+    timer.setInterval(spacing)
+
+    def step():
+        toggle(pending.pop(0))
+        if not pending:
+            timer.stop()
+
+    def action():
+        pending[:] = names
+        timer.start()
+
+    timer.timeout.connect(step)
+    return action
+
+def main():
+    """Compare immediate full repaints with scheduled dirty-region repaints."""
+    work_dir = prepare_data_dir(synthetic_hotkeys(ICON_COUNT))
+    app = QApplication(sys.argv)
+    import overlay
+
+    icon_overlay = overlay.IconOverlay(hooks=False)
+    icon_overlay.update_hotkeys = lambda: None
+    icon_overlay.show()
+    counter = EventCounter(icon_overlay)
+    app.installEventFilter(counter)
+    scheduler = icon_overlay.scheduler
+    names = [f"Icon {i % ICON_COUNT}" for i in range(TOGGLES)]
+    spacing = scheduler.frame_interval * 3
+    duration = TOGGLES * spacing / 1000 + 0.5
+
+    def legacy_toggle(name):
+        icon_overlay.icon_states[name] = not icon_overlay.icon_states[name]
+        icon_overlay.apply_current_state()
+
+    legacy_paints, legacy_area, _ = run(app, counter, spaced(app, legacy_toggle, names, spacing), duration)
+    frames = scheduler.stats["frames"]
+    scheduled_paints, scheduled_area, _ = run(app, counter, spaced(app, icon_overlay.toggle_icon, names, spacing), duration)
+    frames = scheduler.stats["frames"] - frames
+
+    def burst():
+        for i in range(BURST_TOGGLES):
+            icon_overlay.toggle_icon(f"Icon {i % ICON_COUNT}")
+            app.processEvents()
+
+    burst_frames = scheduler.stats["frames"]
+    burst_paints, _, _ = run(app, counter, burst, 0.5)
+    burst_frames = scheduler.stats["frames"] - burst_frames
+    _, _, idle_timers = run(app, counter, lambda: None, IDLE_SECONDS)
+
+    print(f"{TOGGLES} toggles spaced {spacing} ms apart (frame interval {scheduler.frame_interval} ms):")
+    print(f"  Full update: {legacy_paints / TOGGLES:6.2f} paint events, {legacy_area / TOGGLES:10.0f} px repainted per toggle")
+    print(f"  Scheduled:   {scheduled_paints / TOGGLES:6.2f} paint events, {scheduled_area / TOGGLES:10.0f} px repainted per toggle, {frames} frames")
+    print(f"Burst of {BURST_TOGGLES} toggles: {burst_frames} frames, {burst_paints} paint events")
+    print(f"Idle timer wakeups per minute: {idle_timers * 60 / IDLE_SECONDS:.0f}")
+
+    cleanup_data_dir(work_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""Drive the overlay and GUI headlessly for hours and fail on sustained resource growth."""
+import os, sys, gc, csv, json, time, types, random, shutil, argparse, statistics, subprocess, collections
+import psutil
+from bench_utils import REPO_DIR, prepare_data_dir, cleanup_data_dir, synthetic_hotkeys
+from multi_monitor import VirtualScreen
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QRect, QTimer
+
+ICON_COUNT = 30
+ACTION_INTERVAL = 10
+LOCATIONS = ["Top Left", "Top Middle", "Top Right", "Bottom Left", "Bottom Middle", "Bottom Right", "Middle Left", "Middle Right"]
+RESOLUTIONS = [(1920, 1080), (2560, 1440), (3840, 2160), (1280, 720)]
+DEVICE_PIXEL_RATIOS = [1.0, 1.25, 1.5, 2.0]
+ICON_SIZES = [32, 44, 64]
+ACTION_WEIGHTS = {"toggle": 200, "switch_profile": 10, "resize_screen": 10, "relocate": 2, "resize_icons": 2, "edit_icon": 2, "gui": 20}
+GUI_OVERLAY_INTERVAL = 5
+GUI_ICON_LIMIT = 10
+
+GROWTH_LIMITS = {
+    "rss_kb": 16384,
+    "python_objects": 5000,
+    "qt_objects": 20,
+    "threads": 1,
+    "open_files": 2,
+    "tk_widgets": 20,
+    "tk_images": 2,
+    "child_processes": 1,
+}
+
+class Soak:
+    """Apply a random mix of user actions to the overlay and GUI while sampling resource usage.
+
+    The soaked overlay runs in this process so screens can be faked. The GUI runs from its own
+    data directory and starts, stops and restarts a real overlay process there.
+    """
+
+    def __init__(self, app, work_dir, gui=None, gui_dir=None):
+        """Start the overlay on a virtual second screen, and the GUI's overlay process if the GUI runs."""
+        self.app = app
+        self.work_dir = work_dir
+        self.gui = gui
+        self.gui_dir = gui_dir
+        self.process = psutil.Process()
+        self.screen = VirtualScreen("Virtual 2", QRect(1920, 0, 1920, 1080))
+        self.actions = collections.Counter()
+        self.samples = []
+        self.start_time = time.monotonic()
+        self.icon_overlay = None
+        self.max_child_processes = 0
+        self.start_overlay()
+        if gui:
+            self.patch_gui()
+            self.in_gui_dir(gui.start_stop_overlay)
+
+    def start_overlay(self):
+        """Create the overlay as a fresh overlay process would."""
+        import overlay
+        self.icon_overlay = overlay.IconOverlay(hooks=False)
+        self.icon_overlay.on_screen_added(self.screen)
+        self.icon_overlay.show()
+
+    def restart_overlay(self):
+        """Replace the in-process overlay with a fresh one, standing in for an overlay process restart."""
+        self.icon_overlay.shutdown()
+        self.icon_overlay.deleteLater()
+        self.start_overlay()
+
+    def update_settings(self, key, value):
+        """Change a setting the way the GUI does and restart the overlay."""
+        with open("data/overlay_settings.json", "r") as f:
+            settings = json.load(f)
+        settings[key] = value
+        with open("data/overlay_settings.json", "w") as f:
+            json.dump(settings, f, indent=4)
+        self.restart_overlay()
+
+    def step(self):
+        """Run one randomly chosen action."""
+        actions = [action for action in ACTION_WEIGHTS if action != "gui" or self.gui]
+        action = random.choices(actions, weights=[ACTION_WEIGHTS[action] for action in actions])[0]
+        self.actions[action] += 1
+        icon_overlay = self.icon_overlay
+
+        if action == "toggle":
+            icon_overlay.toggle_icon(random.choice(list(icon_overlay.icon_states)))
+        elif action == "switch_profile":
+            icon_overlay.next_profile()
+        elif action == "resize_screen":
+            if random.random() < 0.5:
+                width, height = random.choice(RESOLUTIONS)
+                self.screen.set_geometry(QRect(1920, 0, width, height))
+            else:
+                self.screen.set_device_pixel_ratio(random.choice(DEVICE_PIXEL_RATIOS))
+        elif action == "relocate":
+            self.update_settings("overlay_location", random.choice(LOCATIONS))
+        elif action == "resize_icons":
+            self.update_settings("icon_size", random.choice(ICON_SIZES))
+        elif action == "edit_icon":
+            from icon_import import save_icon_image
+            source = random.choice([os.path.join(self.work_dir, "sample.png"), os.path.join(REPO_DIR, "assets", "Upload_Image.png")])
+            save_icon_image(source, random.choice(list(icon_overlay.profile.icon_paths.values())))
+            self.restart_overlay()
+        elif action == "gui":
+            self.gui_step()
+
+        if self.gui:
+            self.in_gui_dir(self.gui.root.update)
+
+    def patch_gui(self):
+        """Launch the GUI's overlay portably and answer its dialogs without blocking."""
+        gui = self.gui
+        gui.launch_overlay = lambda: subprocess.Popen([sys.executable, os.path.join(REPO_DIR, "src", "overlay.py")], cwd=self.gui_dir,
+                                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        gui.messagebox = types.SimpleNamespace(showerror=self.gui_error, showinfo=lambda *args, **kwargs: None, askyesno=lambda *args, **kwargs: True)
+
+        stop_overlay = gui.stop_overlay
+        def counted_stop_overlay():
+            overlay_process = gui.overlay_pid
+            stop_overlay()
+            self.actions["gui_overlay_quit" if overlay_process.returncode == 0 else "gui_overlay_terminated"] += 1
+        gui.stop_overlay = counted_stop_overlay
+
+    def gui_error(self, title, message, **kwargs):
+        """Count and print an error the GUI would have shown."""
+        self.actions["gui_error"] += 1
+        print(f"GUI error: {message}")
+
+    def in_gui_dir(self, function, *args):
+        """Run a GUI function from the GUI's data directory."""
+        os.chdir(self.gui_dir)
+        try:
+            return function(*args)
+        finally:
+            os.chdir(self.work_dir)
+
+    def gui_step(self):
+        """Select icons, hover the upload button, redraw the location buttons and open the history window."""
+        import tkinter as tk
+        gui = self.gui
+        action = random.choice(["select", "tooltip", "location", "history"])
+        self.actions[f"gui_{action}"] += 1
+
+        if action == "select":
+            self.in_gui_dir(lambda: gui.icon_dropdown.set(random.choice(["New Icon"] + list(gui.load_hotkeys()))))
+        elif action == "tooltip":
+            for event in ["<Enter>"] + ["<Motion>"] * random.randint(1, 5) + random.choice([["<Leave>"], []]):
+                gui.upload_button.event_generate(event, x=random.randint(0, 96), y=random.randint(0, 96))
+        elif action == "location":
+            self.in_gui_dir(gui.update_location_buttons)
+        elif action == "history":
+            self.in_gui_dir(gui.show_history)
+            for window in gui.root.winfo_children():
+                if isinstance(window, tk.Toplevel) and window.title() == "Toggle History":
+                    window.destroy()
+
+    def gui_overlay_step(self):
+        """Run one GUI action that stops, starts or restarts the GUI's overlay process."""
+        action = random.choice(["restart", "start_stop", "relocate", "add_or_delete_icon", "edit_icon"])
+        self.in_gui_dir(self.gui_overlay_action, action)
+        self.max_child_processes = max(self.max_child_processes, len(self.process.children(recursive=True)))
+
+    def gui_overlay_action(self, action):
+        """Apply a GUI action from the GUI's data directory."""
+        import tkinter as tk
+        gui = self.gui
+        icon_names = [name for name in gui.load_hotkeys() if name != "System Mute"]
+        soak_icons = [name for name in icon_names if name.startswith("Soak ")]
+        images = [os.path.join(self.gui_dir, "sample.png"), os.path.join(REPO_DIR, "assets", "Upload_Image.png")]
+
+        if action == "add_or_delete_icon":
+            action = "add_icon" if len(soak_icons) < GUI_ICON_LIMIT and (not soak_icons or random.random() < 0.5) else "delete_icon"
+        self.actions[f"gui_{action}"] += 1
+
+        if action == "restart":
+            gui.restart_overlay()
+        elif action == "start_stop":
+            gui.start_stop_overlay()
+        elif action == "relocate":
+            gui.update_overlay_location(random.choice(LOCATIONS))
+        elif action == "add_icon":
+            number = self.actions["gui_add_icon"]
+            gui.icon_dropdown.set("New Icon")
+            gui.entry_new_name.delete(0, tk.END)
+            gui.entry_new_name.insert(0, f"Soak {number}")
+            gui.entry_hotkey.delete(0, tk.END)
+            gui.entry_hotkey.insert(0, f"Ctrl + Shift + Alt + F{number % 24 + 1} + {number}")
+            gui.previous_image_path = random.choice(images)
+            gui.add_apply_button_enabled = True
+            gui.save_icon(False)
+        elif action == "edit_icon":
+            gui.icon_dropdown.set(random.choice(icon_names))
+            gui.previous_image_path = random.choice([image for image in images if image != gui.previous_image_path])
+            gui.add_apply_button_enabled = True
+            gui.save_icon(False)
+        elif action == "delete_icon":
+            name = random.choice(soak_icons)
+            gui.icon_dropdown.set(name)
+            gui.delete_icon(name)
+
+    def sample(self):
+        """Record the current resource usage of the process."""
+        gc.collect()
+        sample = {
+            "elapsed": round(time.monotonic() - self.start_time, 1),
+            "rss_kb": self.process.memory_info().rss // 1024,
+            "python_objects": len(gc.get_objects()),
+            "qt_objects": count_qt_objects(self.app),
+            "threads": self.process.num_threads(),
+            "open_files": self.process.num_handles() if hasattr(self.process, "num_handles") else self.process.num_fds(),
+        }
+        if self.gui:
+            sample["tk_widgets"] = count_tk_widgets(self.gui.root)
+            sample["tk_images"] = len(self.gui.root.image_names())
+            sample["child_processes"] = len(self.process.children(recursive=True))
+        self.samples.append(sample)
+
+def count_qt_objects(app):
+    """Return the number of QObjects owned by the application and its top-level widgets."""
+    return len(app.findChildren(QObject)) + sum(1 + len(widget.findChildren(QObject)) for widget in app.topLevelWidgets())
+
+def count_tk_widgets(widget):
+    """Return the number of Tk widgets in a widget tree."""
+    return 1 + sum(count_tk_widgets(child) for child in widget.winfo_children())
+
+def start_gui(gui_dir):
+    """Build the GUI in the soak process from the current directory, or return None if Tk cannot run here."""
+    import tkinter as tk
+    shutil.copytree(os.path.join(REPO_DIR, "assets"), os.path.join(gui_dir, "assets"))
+    import overlay_gui
+    try:
+        overlay_gui.create_gui(overlay_gui.load_overlay_settings())
+    except tk.TclError as e:
+        print(f"GUI soak skipped: {e}")
+        if getattr(overlay_gui, "root", None):
+            overlay_gui.root.destroy()
+        return None
+    overlay_gui.load_icon_data("New Icon")
+    return overlay_gui
+
+def analyze(samples, warmup):
+    """Return the growth, hourly trend and verdict of every metric sampled after the warmup."""
+    samples = [sample for sample in samples if sample["elapsed"] >= warmup]
+    results = {}
+    for metric, limit in GROWTH_LIMITS.items():
+        if len(samples) < 8 or metric not in samples[0]:
+            continue
+        times = [sample["elapsed"] for sample in samples]
+        values = [sample[metric] for sample in samples]
+        quarter = len(values) // 4
+        medians = [statistics.median(values[i * quarter:(i + 1) * quarter]) for i in range(4)]
+        growth = medians[-1] - medians[0]
+        rising = all(later >= earlier for earlier, later in zip(medians, medians[1:]))
+
+        mean_time = statistics.fmean(times)
+        mean_value = statistics.fmean(values)
+        variance = sum((t - mean_time) ** 2 for t in times)
+        slope = sum((t - mean_time) * (v - mean_value) for t, v in zip(times, values)) / variance if variance else 0.0
+
+        results[metric] = {
+            "start": medians[0],
+            "end": medians[-1],
+            "growth": growth,
+            "per_hour": slope * 3600,
+            "leak": rising and growth > limit,
+        }
+    return results
+
+def main():
+    """Soak the overlay and GUI, print a trend report and exit non-zero on sustained growth."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hours", type=float, default=4.0, help="How long to run")
+    parser.add_argument("--sample-interval", type=float, default=30.0, help="Seconds between resource samples")
+    parser.add_argument("--warmup", type=float, default=300.0, help="Seconds of samples to ignore while caches fill")
+    parser.add_argument("--feed-port", type=int, default=48297, help="Status feed port of the soaked overlay")
+    parser.add_argument("--control-port", type=int, default=48296, help="Control port of the GUI's overlay process")
+    parser.add_argument("--no-gui", action="store_true", help="Only soak the overlay")
+    parser.add_argument("--report", help="Write every sample to this CSV file")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    hotkeys = synthetic_hotkeys(ICON_COUNT)
+    hotkeys.update({name: keys for name, keys in synthetic_hotkeys(ICON_COUNT, prefix="Stream", first_combo=ICON_COUNT).items() if name != "System Mute"})
+    profiles = {"Gaming": synthetic_hotkeys(ICON_COUNT, prefix="Game", first_combo=ICON_COUNT * 2)}
+
+    gui = gui_dir = None
+    if not args.no_gui:
+        gui_dir = prepare_data_dir(hotkeys, profiles)
+        with open("data/overlay_settings.json", "w") as f:
+            json.dump({"overlay_location": "Top Right", "icon_size": 44, "control_port": args.control_port, "mirror": {"hotkeys": False}}, f, indent=4)
+        gui = start_gui(gui_dir)
+        if not gui:
+            cleanup_data_dir(gui_dir)
+            gui_dir = None
+
+    work_dir = prepare_data_dir(hotkeys, profiles)
+    with open("data/overlay_settings.json", "w") as f:
+        json.dump({
+            "overlay_location": "Top Right",
+            "icon_size": 44,
+            "control_port": 0,
+            "status_feed_port": args.feed_port,
+            "icon_groups": {"Stream": {"icons": [f"Stream {i}" for i in range(ICON_COUNT)], "screen": "Virtual 2", "location": "Bottom Left"}},
+        }, f, indent=4)
+
+    app = QApplication(sys.argv)
+    soak = Soak(app, work_dir, gui, gui_dir)
+
+    action_timer = QTimer()
+    action_timer.timeout.connect(soak.step)
+    action_timer.start(ACTION_INTERVAL)
+    gui_overlay_timer = QTimer()
+    if gui:
+        gui_overlay_timer.timeout.connect(soak.gui_overlay_step)
+        gui_overlay_timer.start(GUI_OVERLAY_INTERVAL * 1000)
+    sample_timer = QTimer()
+    sample_timer.timeout.connect(soak.sample)
+    sample_timer.start(int(args.sample_interval * 1000))
+    QTimer.singleShot(int(args.hours * 3600 * 1000), app.quit)
+    soak.sample()
+    app.exec_()
+    soak.sample()
+    action_timer.stop()
+    gui_overlay_timer.stop()
+    sample_timer.stop()
+    soak.icon_overlay.shutdown()
+    if gui and soak.in_gui_dir(gui.overlay_is_running):
+        soak.in_gui_dir(gui.start_stop_overlay)
+
+    if args.report:
+        with open(os.path.join(REPO_DIR, args.report), "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(soak.samples[0]))
+            writer.writeheader()
+            writer.writerows(soak.samples)
+
+    results = analyze(soak.samples, args.warmup)
+    print(f"Ran {sum(count for action, count in soak.actions.items() if not action.startswith('gui_'))} actions in {soak.samples[-1]['elapsed'] / 3600:.2f} h, {len(soak.samples)} samples")
+    print("Actions: " + ", ".join(f"{action} {count}" for action, count in sorted(soak.actions.items())))
+    print(f"{'Metric':<16}{'Start':>12}{'End':>12}{'Growth':>12}{'Per hour':>12}  Verdict")
+    for metric, result in results.items():
+        verdict = "LEAK" if result["leak"] else "ok"
+        print(f"{metric:<16}{result['start']:>12.0f}{result['end']:>12.0f}{result['growth']:>12.0f}{result['per_hour']:>12.1f}  {verdict}")
+    if not results:
+        print(f"Too few samples after the {args.warmup:.0f} s warmup to detect growth.")
+    if gui:
+        print(f"Most child processes after a GUI overlay action: {soak.max_child_processes}")
+        gui.root.destroy()
+        cleanup_data_dir(gui_dir)
+    cleanup_data_dir(work_dir)
+    sys.exit(1 if any(result["leak"] for result in results.values()) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Initialize global variables"""
+MODIFIER_ORDER = [
+    "Ctrl", "Left Ctrl", "Right Ctrl",
+    "Shift", "Left Shift", "Right Shift",
+    "Alt", "Left Alt", "Right Alt", "Alt Gr",
+    "Windows", "Left Windows", "Right Windows",
+]
+MODIFIER_ALIASES = {
+    "Control": "Ctrl",
+    "Left Control": "Left Ctrl",
+    "Right Control": "Right Ctrl",
+    "Win": "Windows",
+    "Left Win": "Left Windows",
+    "Right Win": "Right Windows",
+}
+GENERIC_MODIFIERS = {
+    "Left Ctrl": "Ctrl",
+    "Right Ctrl": "Ctrl",
+    "Left Shift": "Shift",
+    "Right Shift": "Shift",
+    "Left Alt": "Alt",
+    "Right Alt": "Alt",
+    "Left Windows": "Windows",
+    "Right Windows": "Windows",
+}
+RESERVED_COMBOS = [
+    ["Ctrl", "Alt", "Delete"],
+    ["Ctrl", "Shift", "Esc"],
+    ["Ctrl", "Esc"],
+    ["Alt", "Tab"],
+    ["Alt", "F4"],
+    ["Alt", "Esc"],
+    ["Windows", "D"],
+    ["Windows", "E"],
+    ["Windows", "L"],
+    ["Windows", "R"],
+    ["Windows", "Tab"],
+]
+
+class HotkeyIndex:
+    """Index icon names and normalized key combos for fast conflict checks.
+
+    Combos keep the side of sided modifiers, so Left Ctrl + A and Right Ctrl + A are
+    different hotkeys. A generic modifier such as Ctrl is held whenever either side is,
+    so Ctrl + A shadows both of them.
+    """
+
+    def __init__(self, hotkeys=None):
+        """Initialize the index from a name to key list mapping."""
+        self.names = {}
+        self.entries = {}
+        self.combos = {}
+        self.by_modifiers = {}
+        self.reserved = {normalize_combo(keys) for keys in RESERVED_COMBOS}
+        for name, keys in (hotkeys or {}).items():
+            self.add(name, keys)
+
+    def add(self, name, keys):
+        """Add or replace an icon's combo in the index."""
+        self.remove(name)
+        combo = normalize_combo(keys)
+        self.names[name.casefold()] = name
+        self.entries[name] = combo
+        self.combos.setdefault(combo, []).append(name)
+        self.by_modifiers.setdefault(combo[0], set()).add(combo)
+
+    def remove(self, name):
+        """Remove an icon from the index."""
+        combo = self.entries.pop(name, None)
+        if combo is None:
+            return
+        del self.names[name.casefold()]
+        self.combos[combo].remove(name)
+        if not self.combos[combo]:
+            del self.combos[combo]
+            self.by_modifiers[combo[0]].discard(combo)
+            if not self.by_modifiers[combo[0]]:
+                del self.by_modifiers[combo[0]]
+
+    def find_name(self, name):
+        """Return the indexed name matching a name case-insensitively, if any."""
+        return self.names.get(name.strip().casefold())
+
+    def conflicts(self, keys, ignore=None):
+        """Return (kind, name) pairs for every conflict of a combo with the index."""
+        combo = normalize_combo(keys)
+        modifiers, others = combo
+        conflicts = []
+
+        if generic_combo(combo) in self.reserved:
+            conflicts.append(("reserved", format_combo(combo)))
+
+        for name in self.combos.get(combo, []):
+            if name != ignore:
+                conflicts.append(("duplicate", name))
+
+        for indexed in list(self.by_modifiers):
+            if holds_modifiers(modifiers, indexed):
+                for shorter in {(indexed, others), (indexed, ())}:
+                    if shorter != combo and any(shorter):
+                        conflicts += [("shadowed_by", name) for name in self.combos.get(shorter, []) if name != ignore]
+            if holds_modifiers(indexed, modifiers):
+                candidates = [(indexed, others)] if others else list(self.by_modifiers[indexed])
+                for longer in candidates:
+                    if longer != combo:
+                        conflicts += [("shadows", name) for name in self.combos.get(longer, []) if name != ignore]
+
+        return conflicts
+
+    def all_conflicts(self):
+        """Return a message for every conflict between indexed icons."""
+        messages = []
+        reported = set()
+        for name, combo in self.entries.items():
+            for kind, other in self.conflicts(combo[0] + combo[1], ignore=name):
+                if kind == "shadowed_by":
+                    continue
+                key = (kind, frozenset([name, other]))
+                if key not in reported:
+                    reported.add(key)
+                    messages.append(describe_conflict(name, kind, other, self.entries))
+        return messages
+
+def capitalize_key(key):
+    """Capitalize the first letter of every word in a key."""
+    return ' '.join(word.capitalize() for word in key.split())
+
+def normalize_combo(keys):
+    """Return a combo as canonically ordered modifiers and sorted other keys."""
+    modifiers = set()
+    others = set()
+    for key in keys:
+        key = capitalize_key(key)
+        key = MODIFIER_ALIASES.get(key, key)
+        if key in MODIFIER_ORDER:
+            modifiers.add(key)
+        elif key:
+            others.add(key)
+    return tuple(m for m in MODIFIER_ORDER if m in modifiers), tuple(sorted(others))
+
+def format_combo(combo, separator=" + "):
+    """Format a normalized combo for display or for keyboard registration."""
+    return separator.join(combo[0] + combo[1])
+
+def generic_combo(combo):
+    """Return a normalized combo with every sided modifier replaced by its generic modifier."""
+    modifiers = {GENERIC_MODIFIERS.get(m, m) for m in combo[0]}
+    return tuple(m for m in MODIFIER_ORDER if m in modifiers), combo[1]
+
+def holds_modifiers(held, modifiers):
+    """Return whether holding the held modifiers also holds every one of the given modifiers."""
+    held = set(held) | {GENERIC_MODIFIERS[m] for m in held if m in GENERIC_MODIFIERS}
+    return held.issuperset(modifiers)
+
+def describe_conflict(name, kind, other, entries):
+    """Return a readable message for a conflict found by HotkeyIndex.conflicts."""
+    combo = format_combo(entries[name]) if name in entries else name
+    if kind == "reserved":
+        return f'"{name}" uses {combo}, which is reserved by the system.'
+    if kind == "duplicate":
+        return f'"{name}" and "{other}" both use {combo}.'
+    if kind == "shadowed_by":
+        return f'"{name}" ({combo}) is shadowed by "{other}" ({format_combo(entries[other])}).'
+    return f'"{name}" ({combo}) shadows "{other}" ({format_combo(entries[other])}).'
+
+if __name__ == "__main__":
+    import sys, json
+    path = sys.argv[1] if len(sys.argv) > 1 else "data/hotkeys.json"
+    with open(path, "r") as f:
+        hotkeys = json.load(f)
+    messages = HotkeyIndex({k: v[:-1] for k, v in hotkeys.items()}).all_conflicts()
+    for message in messages:
+        print(message)
+    print(f"{len(messages)} conflicts in {len(hotkeys)} hotkeys.")
@@ -0,0 +1,217 @@
+import os, io, re, sys, json, time, zipfile, tempfile, argparse
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+from hotkey_index import HotkeyIndex, describe_conflict
+
+"""Initialize global variables"""
+HOTKEYS_FILE = "data/hotkeys.json"
+ICONS_DIR = "icons"
+MANIFEST_NAME = "manifest.json"
+ICON_IMAGE_SIZE = 256
+MAX_IMAGE_PIXELS = 8192 * 8192
+
+class IconImportError(Exception):
+    """Raised when an icon pack cannot be imported."""
+
+    def __init__(self, errors):
+        """Initialize the error with every problem found in the pack."""
+        super().__init__("\n".join(errors))
+        self.errors = errors
+
+def normalize_image(data):
+    """Decode, validate and downscale image bytes into a canonical PNG."""
+    with Image.open(io.BytesIO(data)) as img:
+        if img.width * img.height > MAX_IMAGE_PIXELS:
+            raise ValueError(f"image is too large ({img.width}x{img.height})")
+        img.verify()
+
+    with Image.open(io.BytesIO(data)) as img:
+        img = img.convert("RGBA")
+        img.thumbnail((ICON_IMAGE_SIZE, ICON_IMAGE_SIZE), Image.LANCZOS)
+        output = io.BytesIO()
+        img.save(output, "PNG", optimize=True)
+    return output.getvalue()
+
+def normalize_source(source):
+    """Normalize an image given as a file path or raw bytes, returning (png, error)."""
+    try:
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                source = f.read()
+        return normalize_image(source), None
+    except Exception as e:
+        return None, str(e)
+
+def save_icon_image(image_path, icon_path):
+    """Write a normalized copy of an image to the icons folder."""
+    with open(image_path, "rb") as f:
+        data = f.read()
+    png = normalize_image(data)
+    with open(icon_path, "wb") as f:
+        f.write(png)
+
+def sanitize(filename):
+    """Remove characters not allowed by file system and replace spaces with underscores."""
+    return re.sub(r'[<>:"/\\|?*]', '', filename).strip(". ").replace(" ", "_")
+
+def read_pack(source, manifest_path=None):
+    """Return the manifest and an image source (path or bytes) for each entry of a pack."""
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as pack:
+            members = {info.filename: info for info in pack.infolist() if not info.is_dir()}
+            if manifest_path:
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+            else:
+                manifest = json.loads(pack.read(MANIFEST_NAME).decode("utf-8"))
+            images = {}
+            for name, entry in manifest.items():
+                image = entry.get("image", "")
+                images[name] = pack.read(members[image]) if image in members else None
+    else:
+        with open(manifest_path or os.path.join(source, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        images = {}
+        for name, entry in manifest.items():
+            image_path = os.path.join(source, entry.get("image", ""))
+            images[name] = image_path if os.path.isfile(image_path) else None
+    return manifest, images
+
+def parse_hotkey(hotkey):
+    """Return a manifest hotkey as a key list."""
+    if isinstance(hotkey, str):
+        return [key.strip() for key in hotkey.replace(" + ", "+").split("+") if key.strip()]
+    return [str(key) for key in hotkey or []]
+
+def validate_manifest(manifest, images, hotkeys, icons_dir=ICONS_DIR):
+    """Return entries to add and every problem found against the existing hotkeys and icon images."""
+    errors = []
+    entries = {}
+    hotkey_index = HotkeyIndex({k: v[:-1] for k, v in hotkeys.items()})
+    existing_files = {os.path.splitext(file)[0].casefold() for file in os.listdir(icons_dir) if os.path.isfile(os.path.join(icons_dir, file))}
+
+    for key, entry in manifest.items():
+        name = key.strip()
+        keys = parse_hotkey(entry.get("hotkey"))
+        if not name or name == "New Icon" or name == "System Mute":
+            errors.append(f'"{name}" is not a valid icon name.')
+        elif hotkey_index.find_name(name):
+            errors.append(f'"{name}" already exists.')
+        elif sanitize(name).casefold() in existing_files:
+            errors.append(f'"{name}" would overwrite an existing icon image.')
+        elif not keys:
+            errors.append(f'"{name}" has no hotkey.')
+        elif images.get(key) is None:
+            errors.append(f'"{name}" image "{entry.get("image")}" was not found.')
+        else:
+            for kind, other in hotkey_index.conflicts(keys):
+                if kind in ("duplicate", "reserved"):
+                    hotkey_index.add(name, keys)
+                    errors.append(describe_conflict(name, kind, other, hotkey_index.entries))
+            hotkey_index.add(name, keys)
+            existing_files.add(sanitize(name).casefold())
+            entries[name] = keys + [bool(entry.get("enabled", True))]
+    return entries, errors
+
+def normalize_all(images, workers=None):
+    """Normalize images in a process pool, returning PNG bytes and errors by name."""
+    names = list(images)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(normalize_source, [images[name] for name in names], chunksize=4))
+    pngs = {name: png for name, (png, error) in zip(names, results) if png is not None}
+    errors = [f'"{name}" image is invalid: {error}' for name, (png, error) in zip(names, results) if error]
+    return pngs, errors
+
+def commit_import(entries, pngs, hotkeys, hotkeys_file, icons_dir=ICONS_DIR):
+    """Write the icons and hotkeys file together, rolling back on failure."""
+    staging_dir = tempfile.mkdtemp(prefix=".import_", dir=icons_dir)
+    moved = []
+    try:
+        staged = {}
+        for name in entries:
+            staged[name] = os.path.join(staging_dir, f"{sanitize(name)}.png")
+            with open(staged[name], "wb") as f:
+                f.write(pngs[name])
+
+        new_hotkeys = dict(hotkeys)
+        new_hotkeys.update(entries)
+        staged_hotkeys = hotkeys_file + ".import"
+        with open(staged_hotkeys, "w", encoding="utf-8") as f:
+            json.dump(new_hotkeys, f, indent=4, ensure_ascii=False)
+
+        for name, path in staged.items():
+            icon_path = os.path.join(icons_dir, os.path.basename(path))
+            os.replace(path, icon_path)
+            moved.append(icon_path)
+        os.replace(staged_hotkeys, hotkeys_file)
+    except Exception:
+        for icon_path in moved:
+            os.remove(icon_path)
+        if os.path.exists(hotkeys_file + ".import"):
+            os.remove(hotkeys_file + ".import")
+        raise
+    finally:
+        for file in os.listdir(staging_dir):
+            os.remove(os.path.join(staging_dir, file))
+        os.rmdir(staging_dir)
+
+def import_icon_pack(source, manifest_path=None, workers=None, hotkeys_file=HOTKEYS_FILE, icons_dir=ICONS_DIR):
+    """Import a directory or zip of icons described by a manifest into a profile's hotkeys file and icon folder in one transaction."""
+    os.makedirs(icons_dir, exist_ok=True)
+    with open(hotkeys_file, "r", encoding="utf-8") as f:
+        hotkeys = json.load(f)
+
+    try:
+        manifest, images = read_pack(source, manifest_path)
+    except (KeyError, OSError, ValueError) as e:
+        raise IconImportError([f"Failed to read icon pack: {e}"])
+    entries, errors = validate_manifest(manifest, images, hotkeys, icons_dir)
+    if errors:
+        raise IconImportError(errors)
+
+    start = time.perf_counter()
+    pngs, errors = normalize_all({key.strip(): image for key, image in images.items() if key.strip() in entries}, workers)
+    elapsed = time.perf_counter() - start
+    if errors:
+        raise IconImportError(errors)
+
+    commit_import(entries, pngs, hotkeys, hotkeys_file, icons_dir)
+    return {
+        "icons": list(entries),
+        "seconds": elapsed,
+        "images_per_second": len(entries) / elapsed if elapsed else 0.0,
+        "bytes_written": sum(len(png) for png in pngs.values()),
+    }
+
+def benchmark(source, manifest_path=None):
+    """Report normalization throughput for increasing worker counts."""
+    manifest, images = read_pack(source, manifest_path)
+    images = {name: image for name, image in images.items() if image is not None}
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        pngs, errors = normalize_all(images, workers)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>3} workers: {len(pngs) / elapsed:8.1f} images/s ({len(pngs)} images, {len(errors)} errors)")
+        workers *= 2
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import an icon pack into the Microphone Status Overlay.")
+    parser.add_argument("source", help="directory or zip containing the images and manifest.json")
+    parser.add_argument("--manifest", help="manifest to use instead of the pack's manifest.json")
+    parser.add_argument("--workers", type=int, help="number of worker processes")
+    parser.add_argument("--hotkeys", default=HOTKEYS_FILE, help="hotkeys file of the profile to import into")
+    parser.add_argument("--icons", default=ICONS_DIR, help="icon folder of the profile to import into (icons/<profile> for profiles other than Default)")
+    parser.add_argument("--benchmark", action="store_true", help="only report throughput per worker count")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.source, args.manifest)
+        sys.exit(0)
+
+    try:
+        result = import_icon_pack(args.source, args.manifest, args.workers, args.hotkeys, args.icons)
+    except IconImportError as e:
+        print(e)
+        sys.exit(1)
+    print(f"Imported {len(result['icons'])} icons at {result['images_per_second']:.1f} images/s.")
@@ -1,27 +1,213 @@
-import sys, os, re, json, keyboard
-from PyQt5.QtWidgets import QApplication, QWidget, QLabel
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPixmap
+import sys, os, re, hmac, json, math, secrets
+from urllib.parse import quote
+from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QGraphicsOpacityEffect
+from PyQt5.QtCore import Qt, QObject, QTimer, QElapsedTimer, QRect, QBuffer, QIODevice, pyqtSignal
+from PyQt5.QtGui import QPixmap, QImage, QRegion
+from PyQt5.QtNetwork import QTcpServer, QTcpSocket, QHostAddress
+from hotkey_index import HotkeyIndex, normalize_combo, format_combo
+from toggle_history import ToggleHistory
+from state_mirror import StatePublisher, StateSubscriber, MIRROR_GROUP, MIRROR_PORT
+from status_feed import StatusFeed
+from overlay_daemon import attach_segment, read_endpoint, write_endpoint, remove_endpoint, control_endpoint_file
+from process_watcher import ProcessWatcher, process_key, PROCESS_SCAN_INTERVAL
 
 """Initialize global variables"""
 HOTKEYS_FILE = "data/hotkeys.json"
 SETTINGS_FILE = "data/overlay_settings.json"
+PROFILES_DIR = "data/profiles"
+ICONS_DIR = "icons"
+DEFAULT_PROFILE = "Default"
+CONTROL_PORT = 48261
+HISTORY_FLUSH_INTERVAL = 2000
+DAEMON_TIMEOUT = 2000
+
+TRANSITION_DURATIONS = {
+    "Fade": 150,
+    "Pulse": 400,
+}
+
+class RenderScheduler(QObject):
+    """Coalesce overlay state changes into a single repaint per frame."""
+
+    def __init__(self, overlay):
+        """Initialize the frame and animation timers for the overlay."""
+        super().__init__(overlay)
+        self.overlay = overlay
+        self.dirty = set()
+        self.animations = {}
+        self.stats = {"requests": 0, "frames": 0, "repainted_icons": 0, "animation_ticks": 0}
+
+        screen = QApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen else 60
+        self.frame_interval = max(1, round(1000 / (refresh_rate or 60)))
+
+        self.clock = QElapsedTimer()
+        self.clock.start()
+
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setInterval(self.frame_interval)
+        self.frame_timer.timeout.connect(self.render_frame)
+
+        self.animation_timer = QTimer(self)
+        self.animation_timer.setInterval(self.frame_interval)
+        self.animation_timer.timeout.connect(self.step_animations)
+
+    def request_frame(self, icon_names):
+        """Mark icons as dirty and schedule a frame if none is pending."""
+        self.stats["requests"] += 1
+        self.dirty.update(icon_names)
+        if not self.frame_timer.isActive():
+            self.frame_timer.start()
+
+    def render_frame(self):
+        """Apply pending visibility changes and repaint only the affected icons."""
+        self.stats["frames"] += 1
+        dirty, self.dirty = self.dirty, set()
+        region = QRegion()
+
+        for icon_name in dirty:
+            icon, visible = self.overlay.icon_visibility(icon_name)
+            if icon is None or visible == self.target_visibility(icon):
+                continue
+            self.transition(icon, visible)
+            region += icon.geometry()
+            self.stats["repainted_icons"] += 1
+
+        if not region.isEmpty():
+            self.overlay.update(region)
+
+    def target_visibility(self, icon):
+        """Return the visibility an icon has or is animating towards."""
+        if icon in self.animations:
+            return self.animations[icon][1]
+        return icon.isVisibleTo(self.overlay)
+
+    def transition(self, icon, visible):
+        """Show or hide an icon, animating it if transitions are enabled."""
+        mode = self.overlay.settings.get("icon_transition", "None")
+        if mode not in TRANSITION_DURATIONS:
+            icon.setVisible(visible)
+            return
+
+        if visible:
+            icon.show()
+        if not isinstance(icon.graphicsEffect(), QGraphicsOpacityEffect):
+            icon.setGraphicsEffect(QGraphicsOpacityEffect(icon))
+        self.animations[icon] = (self.clock.elapsed(), visible, mode)
+        self.step_animations()
+        if self.animations and not self.animation_timer.isActive():
+            self.animation_timer.start()
+
+    def cancel_animations(self):
+        """Drop running transitions, leaving icons at their current visibility."""
+        for icon in self.animations:
+            icon.setGraphicsEffect(None)
+        self.animations.clear()
+        self.animation_timer.stop()
+
+    def step_animations(self):
+        """Advance running transitions and stop the timer once all are finished."""
+        self.stats["animation_ticks"] += 1
+        now = self.clock.elapsed()
+
+        for icon, (start, visible, mode) in list(self.animations.items()):
+            progress = min(1.0, (now - start) / TRANSITION_DURATIONS[mode])
+            if not visible:
+                opacity = 1.0 - progress
+            elif mode == "Pulse":
+                opacity = 1.0 - 0.6 * abs(math.sin(2 * math.pi * progress))
+            else:
+                opacity = progress
+            icon.graphicsEffect().setOpacity(opacity)
+
+            if progress >= 1.0:
+                del self.animations[icon]
+                icon.setGraphicsEffect(None)
+                icon.setVisible(visible)
+
+        if not self.animations:
+            self.animation_timer.stop()
+
+class HotkeyProfile:
+    """Hold a named profile's hotkeys, states, dispatch table and icon widgets."""
+
+    def __init__(self, name, path, hotkeys_data):
+        """Initialize the profile from its hotkeys.json-style data."""
+        self.name = name
+        self.path = path
+        self.hotkeys = {k: v[:-1] for k, v in hotkeys_data.items()}
+        self.icon_states = {k: v[-1] for k, v in hotkeys_data.items()}
+        self.index = HotkeyIndex(self.hotkeys)
+        self.dispatch = {format_combo(combo, "+"): names for combo, names in self.index.combos.items()}
+        self.icons_dir = profile_icons_dir(name)
+        self.icon_paths = {}
+        self.icons = {}
+        self.master_mute_icon = None
+        self.groups = []
+
+class IconGroup:
+    """Hold a group of icons placed together on one screen."""
+
+    def __init__(self, name, icon_names, screen_key, location, master_mute=False):
+        """Initialize the group with its configured screen and location."""
+        self.name = name
+        self.icon_names = icon_names
+        self.screen_key = screen_key
+        self.location = location
+        self.master_mute = master_mute
+        self.screen = None
+        self.device_pixel_ratio = None
 
 class IconOverlay(QWidget):
     """Manage the icon overlay."""
 
-    def __init__(self):
+    hotkey_triggered = pyqtSignal(str)
+
+    def __init__(self, hooks=True):
         """Initialize the IconOverlay widget."""
         super().__init__(flags=Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint | Qt.Tool | Qt.WindowTransparentForInput)
         self.setAttribute(Qt.WA_TranslucentBackground)
+        self.scheduler = RenderScheduler(self)
+        self.hotkey_triggered.connect(self.dispatch_combo)
+        self.profile_combo = None
 
         self.load_overlay_settings()
         self.load_hotkeys()
         self.cache_icon_paths()
+        self.hooks = hooks and self.settings.get("mirror", {}).get("hotkeys", True)
+        self.setup_daemon()
         self.setup_overlay()
-        self.setup_key_combos()
+        if self.hooks and not self.daemon:
+            self.setup_key_combos()
+        self.setup_control_server()
+        self.setup_history()
+        self.setup_mirror()
+        self.setup_status_feed()
+        self.setup_process_watcher()
+        QApplication.instance().aboutToQuit.connect(self.shutdown)
         self.apply_current_state()
 
+    @property
+    def hotkeys(self):
+        """Return the hotkeys of the active profile."""
+        return self.profile.hotkeys
+
+    @property
+    def icon_states(self):
+        """Return the icon states of the active profile."""
+        return self.profile.icon_states
+
+    @property
+    def icons(self):
+        """Return the icon widgets of the active profile."""
+        return self.profile.icons
+
+    @property
+    def master_mute_icon(self):
+        """Return the System Mute icon widget of the active profile."""
+        return self.profile.master_mute_icon
+
     def load_overlay_settings(self):
         """Load overlay settings from overlay_settings.json."""
         try:
@@ -37,7 +223,7 @@ class IconOverlay(QWidget):
                 json.dump(self.settings, f, indent=4)
 
     def load_hotkeys(self):
-        """Load hotkeys from hotkeys.json or initialize System Mute hotkey."""
+        """Load every hotkey profile, initializing the default profile if needed."""
         try:
             with open(HOTKEYS_FILE, "r") as f:
                 hotkeys_data = json.load(f)
@@ -47,137 +233,595 @@ class IconOverlay(QWidget):
             with open(HOTKEYS_FILE, "w") as f:
                 json.dump(hotkeys_data, f, indent=4)
 
-        self.hotkeys = {k: v[:-1] for k, v in hotkeys_data.items()}
-        self.icon_states = {k: v[-1] for k, v in hotkeys_data.items()}
+        self.profiles = {DEFAULT_PROFILE: HotkeyProfile(DEFAULT_PROFILE, HOTKEYS_FILE, hotkeys_data)}
+
+        if os.path.isdir(PROFILES_DIR):
+            for file in sorted(os.listdir(PROFILES_DIR)):
+                name, extension = os.path.splitext(file)
+                if extension != ".json" or name == DEFAULT_PROFILE:
+                    continue
+                path = os.path.join(PROFILES_DIR, file)
+                try:
+                    with open(path, "r") as f:
+                        self.profiles[name] = HotkeyProfile(name, path, json.load(f))
+                except (OSError, ValueError) as e:
+                    print(f"Error loading profile {name}: {e}")
+
+        for profile in self.profiles.values():
+            for message in profile.index.all_conflicts():
+                print(f"Hotkey conflict in profile {profile.name}: {message}")
+
+        active_profile = self.settings.get("active_profile", DEFAULT_PROFILE)
+        self.profile = self.profiles.get(active_profile, self.profiles[DEFAULT_PROFILE])
 
     def cache_icon_paths(self):
-        """Cache the file paths for all icon images."""
-        self.icon_paths = {}
-        for icon_name in self.hotkeys.keys():
-            sanitized_icon_name = sanitize(icon_name)
-            for file in os.listdir("icons"):
-                if file.startswith(f"{sanitized_icon_name}."):
-                    self.icon_paths[icon_name] = os.path.join("icons", file)
-                    break
+        """Cache the file paths of every profile's icon images, each profile reading its own icon folder."""
+        for profile in self.profiles.values():
+            icon_files = {}
+            if os.path.isdir(profile.icons_dir):
+                for file in os.listdir(profile.icons_dir):
+                    path = os.path.join(profile.icons_dir, file)
+                    if os.path.isfile(path):
+                        icon_files.setdefault(os.path.splitext(file)[0], path)
+
+            profile.icon_paths = {}
+            for icon_name in profile.hotkeys.keys():
+                sanitized_icon_name = sanitize(icon_name)
+                if sanitized_icon_name in icon_files:
+                    profile.icon_paths[icon_name] = icon_files[sanitized_icon_name]
     
     def setup_overlay(self):
-        """Set up the overlay according to overlay_settings.json."""
-        screen = QApplication.primaryScreen().geometry()
-        self.setGeometry(0, 0, screen.width(), screen.height())
+        """Set up the overlay across all screens according to overlay_settings.json."""
+        self.pixmaps = {}
+        self.layout_cache = {}
+        self.layout_stats = {"group_layouts": 0, "cache_misses": 0, "rescaled_icons": 0}
+        self.screens = []
+        for screen in QApplication.screens():
+            self.watch_screen(screen)
+        self.update_overlay_geometry()
 
-        self.icons = {}
-        self.master_mute_icon = None
+        app = QApplication.instance()
+        app.screenAdded.connect(self.on_screen_added)
+        app.screenRemoved.connect(self.on_screen_removed)
 
-        x_start, y_start, x_direction, y_direction = self.overlay_location()
-        x_offset, y_offset = x_start, y_start
+        for profile in self.profiles.values():
+            self.setup_profile_icons(profile)
+            for group in profile.groups:
+                self.layout_group(profile, group)
 
-        if "System Mute" in self.hotkeys:
-            self.master_mute_icon = self.create_icons("System Mute", x_offset, y_offset)
+    def setup_profile_icons(self, profile):
+        """Create the hidden icon widgets and icon groups of a profile ahead of time."""
+        if "System Mute" in profile.hotkeys:
+            profile.master_mute_icon = self.create_icons("System Mute")
 
-        for icon_name in self.hotkeys.keys():
+        for icon_name in profile.hotkeys.keys():
             if icon_name != "System Mute":
-                icon = self.create_icons(icon_name, x_offset, y_offset)
-                self.icons[icon_name] = icon
-                
-                x_offset += x_direction * (self.settings["icon_size"] + 5)
-                y_offset += y_direction * (self.settings["icon_size"] + 5)
+                profile.icons[icon_name] = self.create_icons(icon_name)
+
+        grouped = set()
+        for group_name, group in self.settings.get("icon_groups", {}).items():
+            icon_names = [icon_name for icon_name in group.get("icons", []) if icon_name in profile.icons and icon_name not in grouped]
+            grouped.update(icon_names)
+            profile.groups.append(IconGroup(group_name, icon_names, group.get("screen"), group.get("location", self.settings["overlay_location"])))
+
+        default_icons = [icon_name for icon_name in profile.icons if icon_name not in grouped]
+        profile.groups.insert(0, IconGroup(None, default_icons, self.settings.get("overlay_screen"), self.settings["overlay_location"], master_mute=True))
+
+    def watch_screen(self, screen):
+        """Track a screen and relayout its icons when its geometry or DPI changes."""
+        self.screens.append(screen)
+        screen.geometryChanged.connect(self.on_screen_signal)
+        screen.availableGeometryChanged.connect(self.on_screen_signal)
+        screen.logicalDotsPerInchChanged.connect(self.on_screen_signal)
+
+    def on_screen_added(self, screen):
+        """Place groups configured for a newly added screen on it."""
+        self.watch_screen(screen)
+        if self.update_overlay_geometry():
+            self.relayout(lambda group: True)
+        else:
+            self.relayout(lambda group: self.resolve_screen(group.screen_key) is not group.screen)
+
+    def on_screen_removed(self, screen):
+        """Move groups from a removed screen, or whose configured screen index now resolves elsewhere."""
+        if screen in self.screens:
+            self.screens.remove(screen)
+        if self.update_overlay_geometry():
+            self.relayout(lambda group: True)
+        else:
+            self.relayout(lambda group: group.screen is screen or self.resolve_screen(group.screen_key) is not group.screen)
+
+    def on_screen_signal(self, *args):
+        """Handle a geometry or DPI change of the screen that sent it."""
+        self.on_screen_changed(self.sender())
+
+    def on_screen_changed(self, screen):
+        """Relayout only the groups shown on a screen whose geometry or DPI changed."""
+        if self.update_overlay_geometry():
+            self.relayout(lambda group: True)
+        else:
+            self.relayout(lambda group: group.screen is screen)
+
+    def update_overlay_geometry(self):
+        """Cover every screen with the overlay, returning whether its origin moved."""
+        virtual_geometry = QRect()
+        for screen in self.screens:
+            virtual_geometry = virtual_geometry.united(screen.geometry())
+        origin_moved = virtual_geometry.topLeft() != self.geometry().topLeft()
+        self.setGeometry(virtual_geometry)
+        return origin_moved
+
+    def resolve_screen(self, screen_key):
+        """Return the screen matching a configured name or index, or the primary screen."""
+        if isinstance(screen_key, int) and 0 <= screen_key < len(self.screens):
+            return self.screens[screen_key]
+        for screen in self.screens:
+            if screen.name() == screen_key:
+                return screen
+        primary_screen = QApplication.primaryScreen()
+        return primary_screen if primary_screen in self.screens else self.screens[0]
+
+    def relayout(self, affected):
+        """Relayout the groups of every profile matching a predicate."""
+        for profile in self.profiles.values():
+            for group in profile.groups:
+                if affected(group):
+                    self.layout_group(profile, group)
+        self.update()
+
+    def layout_group(self, profile, group):
+        """Position a group's icons using the cached layout for its screen."""
+        self.layout_stats["group_layouts"] += 1
+        screen = self.resolve_screen(group.screen_key)
+        geometry = screen.geometry()
+        device_pixel_ratio = screen.devicePixelRatio()
+        icon_size = self.settings["icon_size"]
+        slot_count = len(group.icon_names) + (1 if group.master_mute and profile.master_mute_icon else 0)
+
+        key = (geometry.x(), geometry.y(), geometry.width(), geometry.height(), device_pixel_ratio, group.location, slot_count, icon_size)
+        if key not in self.layout_cache:
+            self.layout_cache[key] = overlay_positions(geometry, group.location, slot_count, icon_size)
+            self.layout_stats["cache_misses"] += 1
+        positions = self.layout_cache[key]
+
+        icons = [(icon_name, profile.icons[icon_name]) for icon_name in group.icon_names]
+        if group.master_mute and profile.master_mute_icon:
+            icons.insert(0, ("System Mute", profile.master_mute_icon))
+            positions = positions[:1] + positions[:-1]
+
+        rescale = device_pixel_ratio != group.device_pixel_ratio
+        for (icon_name, icon), (x, y) in zip(icons, positions):
+            icon.setGeometry(x - self.x(), y - self.y(), icon_size, icon_size)
+            if rescale and icon_name in profile.icon_paths:
+                icon.setPixmap(self.scaled_pixmap(profile.icon_paths[icon_name], device_pixel_ratio))
+                self.layout_stats["rescaled_icons"] += 1
+
+        group.screen = screen
+        group.device_pixel_ratio = device_pixel_ratio
+
+    def key_combos(self):
+        """Return every profile's key combos and the profile switching combo."""
+        combos = set()
+        for profile in self.profiles.values():
+            combos.update(profile.dispatch.keys())
+
+        profile_hotkey = self.settings.get("profile_hotkey")
+        self.profile_combo = format_combo(normalize_combo(profile_hotkey), "+") if profile_hotkey else None
+        if self.profile_combo:
+            combos.add(self.profile_combo)
+        return combos
 
     def setup_key_combos(self):
-        """Manage current key combos."""
+        """Register every profile's key combos with a single hook each."""
+        import keyboard
         self.last_combo = None
-        for hotkey, combo in self.hotkeys.items():
-            keyboard.add_hotkey("+".join(combo), self.check_hotkey, args=(hotkey,))
+        for combo in self.key_combos():
+            keyboard.add_hotkey(combo, self.check_hotkey, args=(combo,))
         
         keyboard.on_release(self.reset_last_combo)
 
-    def apply_current_state(self):
-        """Apply current mute states to icons."""
-        if self.icon_states["System Mute"]:
-            for icon in self.icons.values():
-                icon.hide()
-            if self.master_mute_icon:
-                self.master_mute_icon.show()
-        else:
-            if self.master_mute_icon:
-                self.master_mute_icon.hide()
-            for icon_name, icon in self.icons.items():
-                icon.setVisible(self.icon_states[icon_name])
-        
-        self.update()
+    def setup_daemon(self):
+        """Take hotkeys and scaled icons from this user's shared overlay daemon if the daemon is enabled."""
+        self.daemon = None
+        self.shared_assets = {}
+        self.shared_segments = {}
+        if not self.settings.get("daemon"):
+            return
+        try:
+            port, token = read_endpoint(self.settings.get("daemon_endpoint"))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error reading overlay daemon endpoint: {e}")
+            return
 
-    def overlay_location(self):
-        """Update the overlay location and icon orientation."""
-        screen = QApplication.primaryScreen().geometry()
-        icon_size = self.settings["icon_size"]
-        padding = 3
-        total_width = (len(self.hotkeys) - 1) * (icon_size + padding)
-        total_height = total_width
-
-        positions = {
-            "Top Left": (padding, padding, 1, 0),
-            "Top Middle": (screen.width() // 2 - total_width // 2, padding, 1, 0),
-            "Top Right": (screen.width() - icon_size - padding, padding, -1, 0),
-            "Bottom Left": (padding, screen.height() - icon_size - padding, 1, 0),
-            "Bottom Middle": (screen.width() // 2 - total_width // 2, screen.height() - icon_size - padding, 1, 0),
-            "Bottom Right": (screen.width() - icon_size - padding, screen.height() - icon_size - padding, -1, 0),
-            "Middle Left": (padding, screen.height() // 2 - total_height // 2, 0, 1),
-            "Middle Right": (screen.width() - icon_size - padding, screen.height() // 2 - total_height // 2, 0, 1)
+        daemon = QTcpSocket(self)
+        daemon.connectToHost(QHostAddress(QHostAddress.LocalHost), port)
+        hello = {
+            "type": "hello",
+            "token": token,
+            "combos": sorted(self.key_combos()) if self.hooks else [],
+            "icons": sorted({os.path.abspath(icon_path) for profile in self.profiles.values() for icon_path in profile.icon_paths.values()}),
+            "sizes": sorted({round(self.settings["icon_size"] * screen.devicePixelRatio()) for screen in QApplication.screens()}),
         }
+        if daemon.waitForConnected(DAEMON_TIMEOUT):
+            daemon.write(json.dumps(hello).encode("utf-8") + b"\n")
+            while not daemon.canReadLine() and daemon.waitForReadyRead(DAEMON_TIMEOUT):
+                pass
+        try:
+            reply = json.loads(bytes(daemon.readLine())) if daemon.canReadLine() else {"error": daemon.errorString()}
+        except ValueError as e:
+            reply = {"error": str(e)}
+        if reply.get("type") != "assets":
+            print(f"Error connecting to overlay daemon: {reply.get('error')}")
+            daemon.abort()
+            daemon.deleteLater()
+            return
+
+        try:
+            for icon_path, size, segment_name, offset in reply["assets"]:
+                if segment_name not in self.shared_segments:
+                    self.shared_segments[segment_name] = attach_segment(segment_name)
+                self.shared_assets[(icon_path, size)] = (segment_name, offset)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error loading shared icons from overlay daemon: {e}")
+        self.daemon = daemon
+        daemon.readyRead.connect(self.read_daemon_events)
+        daemon.disconnected.connect(self.on_daemon_disconnected)
+
+    def read_daemon_events(self):
+        """Dispatch combos forwarded by the overlay daemon."""
+        while self.daemon and self.daemon.canReadLine():
+            try:
+                message = json.loads(bytes(self.daemon.readLine()))
+            except ValueError:
+                continue
+            if message.get("type") == "combo":
+                self.dispatch_combo(message["combo"])
+
+    def on_daemon_disconnected(self):
+        """Fall back to this overlay's own keyboard hook when the daemon goes away."""
+        print("Lost connection to overlay daemon")
+        self.daemon.deleteLater()
+        self.daemon = None
+        if self.hooks:
+            self.setup_key_combos()
+
+    def setup_control_server(self):
+        """Listen for control commands from local clients and publish the port and token to this user's endpoint file."""
+        self.control_server = QTcpServer(self)
+        self.control_server.newConnection.connect(self.accept_control_connection)
+        self.control_token = secrets.token_hex(16)
+        self.control_clients = set()
+        port = self.settings.get("control_port", CONTROL_PORT)
+        if not port:
+            return
+        if not self.control_server.listen(QHostAddress.LocalHost, port):
+            print(f"Error starting control server on port {port}: {self.control_server.errorString()}, using a free port")
+            if not self.control_server.listen(QHostAddress.LocalHost, 0):
+                print(f"Error starting control server: {self.control_server.errorString()}")
+                return
+        try:
+            write_endpoint(control_endpoint_file(), self.control_server.serverPort(), self.control_token)
+        except OSError as e:
+            print(f"Error writing control endpoint: {e}")
+
+    def setup_history(self):
+        """Open the toggle history log and record the starting states."""
+        self.history = None
+        if not self.settings.get("toggle_history", True):
+            return
+        self.history = ToggleHistory()
+        self.history.record_snapshot(self.icon_states)
+        self.history_timer = QTimer(self)
+        self.history_timer.setSingleShot(True)
+        self.history_timer.setInterval(HISTORY_FLUSH_INTERVAL)
+        self.history_timer.timeout.connect(self.history.flush)
+        self.history_timer.start()
+
+    def setup_mirror(self):
+        """Publish and/or mirror icon states over the LAN if enabled in the settings."""
+        self.publisher = None
+        self.subscriber = None
+        mirror = self.settings.get("mirror", {})
+        mode = mirror.get("mode")
+        group = mirror.get("group", MIRROR_GROUP)
+        port = mirror.get("port", MIRROR_PORT)
+
+        if mode in ("publish", "both"):
+            self.publisher = StatePublisher(lambda: dict(self.icon_states), group, port, self)
+        if mode in ("subscribe", "both"):
+            self.subscriber = StateSubscriber(group, port, self.publisher, self)
+            self.subscriber.states_received.connect(lambda icon_states, sent_time: self.set_icon_states(icon_states, "mirror"))
+
+    def setup_status_feed(self):
+        """Serve icon states to browser sources if a status feed port is set."""
+        self.status_feed = None
+        port = self.settings.get("status_feed_port")
+        if not port:
+            return
+        self.status_feed = StatusFeed(port=port, allow_origin=self.settings.get("status_feed_allow_origin"))
+        self.set_status_feed_icons()
+        self.status_feed.activate(self.profile.name, self.icon_states)
+        self.status_feed.start()
+
+    def shutdown(self):
+        """Close the control server, daemon connection, toggle history and status feed."""
+        if self.control_server.isListening():
+            self.control_server.close()
+            remove_endpoint(control_endpoint_file(), self.control_token)
+        if self.daemon:
+            self.daemon.disconnected.disconnect(self.on_daemon_disconnected)
+            self.daemon.abort()
+            self.daemon = None
+        if self.history:
+            self.history_timer.stop()
+            self.history.close()
+            self.history = None
+        if self.status_feed:
+            self.status_feed.stop()
+            self.status_feed = None
+        if self.process_watcher:
+            self.process_watcher.stop()
+            self.process_watcher = None
+
+    def setup_process_watcher(self):
+        """Watch the processes icons are bound to in the settings, if any."""
+        self.process_watcher = None
+        self.process_icons = {icon_name: process_key(process_name) for icon_name, process_name in self.settings.get("icon_processes", {}).items()}
+        self.inactive_icons = set()
+        if not self.process_icons:
+            return
+        self.process_watcher = ProcessWatcher(self.process_icons.values(), self.settings.get("process_scan_interval", PROCESS_SCAN_INTERVAL), self)
+        self.process_watcher.processes_changed.connect(self.on_processes_changed)
+        self.process_watcher.start()
+
+    def on_processes_changed(self, running, initial):
+        """Show or hide icons bound to processes, resetting them when their process starts or exits."""
+        affected = [icon_name for icon_name, process_name in self.process_icons.items() if process_name in running]
+        reset = {}
+        for icon_name in affected:
+            if running[self.process_icons[icon_name]]:
+                self.inactive_icons.discard(icon_name)
+            else:
+                self.inactive_icons.add(icon_name)
+            if self.icon_states.get(icon_name) and not (initial and running[self.process_icons[icon_name]]):
+                reset[icon_name] = False
+
+        self.icon_states.update(reset)
+        self.scheduler.request_frame([icon_name for icon_name in affected if icon_name in self.icon_states])
+        if reset:
+            self.record_toggle(reset, "process")
+            self.update_hotkeys()
+
+    def set_status_feed_icons(self):
+        """Send every profile's icon metadata and the PNG encoded icons of all profiles to the status feed once."""
+        icon_sets = {}
+        images = {}
+        for profile in self.profiles.values():
+            icons = icon_sets[profile.name] = []
+            for icon_name, combo in profile.hotkeys.items():
+                icon_path = profile.icon_paths.get(icon_name)
+                icons.append({"name": icon_name, "hotkey": " + ".join(combo),
+                              "image": f"/icons/{quote(profile.name, safe='')}/{quote(icon_name, safe='')}.png" if icon_path else None})
+                if icon_path:
+                    buffer = QBuffer()
+                    buffer.open(QIODevice.WriteOnly)
+                    self.scaled_pixmap(icon_path).save(buffer, "PNG")
+                    images[f"{profile.name}/{icon_name}"] = bytes(buffer.data())
+        self.status_feed.set_icon_sets(icon_sets, images)
+
+    def record_toggle(self, icon_states, source):
+        """Queue icon states in the toggle history and publish them to mirrors."""
+        if self.history:
+            for icon_name, state in icon_states.items():
+                self.history.record(icon_name, state, source)
+            if not self.history_timer.isActive():
+                self.history_timer.start()
+        if self.publisher and source != "mirror":
+            self.publisher.publish(icon_states)
+        if self.status_feed:
+            self.status_feed.publish(icon_states)
+
+    def set_icon_states(self, icon_states, source):
+        """Apply icon states from another source without saving them to the hotkeys file."""
+        changed = {icon_name: state for icon_name, state in icon_states.items()
+                   if icon_name in self.icon_states and self.icon_states[icon_name] != state}
+        if not changed:
+            return
+        self.icon_states.update(changed)
+        self.scheduler.request_frame(self.icon_states.keys() if "System Mute" in changed else changed.keys())
+        self.record_toggle(changed, source)
+
+    def accept_control_connection(self):
+        """Accept pending control connections."""
+        while self.control_server.hasPendingConnections():
+            connection = self.control_server.nextPendingConnection()
+            connection.readyRead.connect(lambda c=connection: self.read_control_commands(c))
+            connection.disconnected.connect(lambda c=connection: self.control_clients.discard(c))
+            connection.disconnected.connect(connection.deleteLater)
 
-        return positions.get(self.settings["overlay_location"], positions["Top Right"])
+    def read_control_commands(self, connection):
+        """Handle newline separated control commands, closing connections that do not start with "auth <token>"."""
+        while connection.canReadLine():
+            command, _, argument = bytes(connection.readLine()).decode("utf-8", "replace").strip().partition(" ")
+            if connection not in self.control_clients:
+                if command != "auth" or not hmac.compare_digest(argument.encode("utf-8"), self.control_token.encode("utf-8")):
+                    connection.write(b"error\n")
+                    connection.disconnectFromHost()
+                    return
+                self.control_clients.add(connection)
+                connection.write(f"ok {os.getpid()}\n".encode("utf-8"))
+            elif command == "profile" and argument in self.profiles:
+                self.switch_profile(argument)
+                connection.write(b"ok\n")
+            elif command == "toggle" and argument in self.icon_states:
+                self.toggle_icon(argument, "control")
+                connection.write(b"ok\n")
+            elif command == "quit":
+                connection.write(b"ok\n")
+                connection.flush()
+                QApplication.quit()
+            else:
+                connection.write(b"error\n")
 
-    def create_icons(self, icon_name, x, y):
+    def apply_current_state(self):
+        """Apply current mute states to icons without waiting for a frame."""
+        for icon_name in self.icon_states:
+            icon, visible = self.icon_visibility(icon_name)
+            if icon:
+                icon.setVisible(visible)
+
+        self.update()
+
+    def icon_visibility(self, icon_name):
+        """Return an icon widget and whether it should currently be visible."""
+        system_muted = self.icon_states.get("System Mute", False)
+        if icon_name == "System Mute":
+            return self.master_mute_icon, system_muted
+        return self.icons.get(icon_name), not system_muted and self.icon_states[icon_name] and icon_name not in self.inactive_icons
+
+    def create_icons(self, icon_name):
         """Create and set properties for overlay icons."""
         icon = QLabel(self)
         icon.setAttribute(Qt.WA_TransparentForMouseEvents)
-        if icon_name in self.icon_paths:
-            icon_path = self.icon_paths[icon_name]
-            pixmap = QPixmap(icon_path).scaled(self.settings["icon_size"], self.settings["icon_size"], Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
-            icon.setPixmap(pixmap)
-        icon.setGeometry(x, y, self.settings["icon_size"], self.settings["icon_size"])
+        icon.hide()
         return icon
 
-    def check_hotkey(self, hotkey):
+    def scaled_pixmap(self, icon_path, device_pixel_ratio=1.0):
+        """Return the scaled pixmap for an icon image at a DPI, sharing it between profiles."""
+        key = (icon_path, device_pixel_ratio)
+        if key not in self.pixmaps:
+            size = round(self.settings["icon_size"] * device_pixel_ratio)
+            shared = self.shared_assets.get((os.path.abspath(icon_path), size))
+            if shared:
+                segment_name, offset = shared
+                with self.shared_segments[segment_name].buf[offset:offset + size * size * 4] as pixels:
+                    pixmap = QPixmap.fromImage(QImage(pixels, size, size, size * 4, QImage.Format_RGBA8888))
+            else:
+                pixmap = QPixmap(icon_path).scaled(size, size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            pixmap.setDevicePixelRatio(device_pixel_ratio)
+            self.pixmaps[key] = pixmap
+        return self.pixmaps[key]
+
+    def check_hotkey(self, combo):
         """Check if current key combo matches a hotkey"""
+        import keyboard
         current_keys = keyboard.get_hotkey_name().split("+")
         current_combo = current_keys[-1]
 
         if current_combo != self.last_combo:
             self.last_combo = current_combo
-            self.toggle_icon(hotkey)
+            self.hotkey_triggered.emit(combo)
 
     def reset_last_combo(self, event):
         """Reset the last key combo."""
         self.last_combo = None
 
-    def toggle_icon(self, icon_name):
+    def dispatch_combo(self, combo):
+        """Toggle the icon bound to a combo in the active profile."""
+        if combo == self.profile_combo:
+            self.next_profile()
+        else:
+            for icon_name in self.profile.dispatch.get(combo, []):
+                self.toggle_icon(icon_name)
+
+    def next_profile(self):
+        """Switch to the profile after the active one."""
+        names = list(self.profiles.keys())
+        self.switch_profile(names[(names.index(self.profile.name) + 1) % len(names)])
+
+    def switch_profile(self, name):
+        """Swap the active profile and repaint its prepared icons."""
+        if name not in self.profiles or self.profiles[name] is self.profile:
+            return
+
+        self.scheduler.cancel_animations()
+        self.scheduler.dirty.clear()
+        for icon in [self.master_mute_icon] + list(self.icons.values()):
+            if icon:
+                icon.hide()
+
+        self.profile = self.profiles[name]
+        self.apply_current_state()
+        if self.status_feed:
+            self.status_feed.activate(name, self.icon_states)
+        self.record_toggle(self.icon_states, "snapshot")
+        QTimer.singleShot(0, self.save_active_profile)
+
+    def save_active_profile(self):
+        """Save the active profile to overlay_settings.json."""
+        try:
+            with open(SETTINGS_FILE, "r") as f:
+                settings = json.load(f)
+            settings["active_profile"] = self.profile.name
+            with open(SETTINGS_FILE, "w") as f:
+                json.dump(settings, f, indent=4)
+        except Exception as e:
+            print(f"Error updating overlay_settings.json: {e}")
+
+    def toggle_icon(self, icon_name, source="hotkey"):
         """Toggle an icon's visibility."""
         if icon_name == "System Mute":
             self.icon_states["System Mute"] = not self.icon_states["System Mute"]
+            self.scheduler.request_frame(self.icon_states.keys())
         elif icon_name in self.icons:
             self.icon_states[icon_name] = not self.icon_states[icon_name]
+            self.scheduler.request_frame([icon_name])
+        else:
+            return
         
-        self.apply_current_state()
+        self.record_toggle({icon_name: self.icon_states[icon_name]}, source)
         self.update_hotkeys()
 
     def update_hotkeys(self):
-        """Update hotkeys.json with updated hotkey data."""
+        """Update the active profile's hotkeys file with updated hotkey data."""
         try:
-            with open(HOTKEYS_FILE, "r") as f:
+            with open(self.profile.path, "r") as f:
                 hotkeys_data = json.load(f)
             for icon_name, state in self.icon_states.items():
                 if icon_name in hotkeys_data:
                     hotkeys_data[icon_name][-1] = state
-            with open(HOTKEYS_FILE, "w") as f:
+            with open(self.profile.path, "w") as f:
                 json.dump(hotkeys_data, f, indent=4)
         except Exception as e:
-            print(f"Error updating hotkeys.json: {e}")
+            print(f"Error updating {os.path.basename(self.profile.path)}: {e}")
+
+def overlay_location(screen, location, icon_count, icon_size):
+    """Return the first icon position and icon orientation for a location on a screen."""
+    padding = 3
+    total_width = (icon_count - 1) * (icon_size + padding)
+    total_height = total_width
+
+    positions = {
+        "Top Left": (padding, padding, 1, 0),
+        "Top Middle": (screen.width() // 2 - total_width // 2, padding, 1, 0),
+        "Top Right": (screen.width() - icon_size - padding, padding, -1, 0),
+        "Bottom Left": (padding, screen.height() - icon_size - padding, 1, 0),
+        "Bottom Middle": (screen.width() // 2 - total_width // 2, screen.height() - icon_size - padding, 1, 0),
+        "Bottom Right": (screen.width() - icon_size - padding, screen.height() - icon_size - padding, -1, 0),
+        "Middle Left": (padding, screen.height() // 2 - total_height // 2, 0, 1),
+        "Middle Right": (screen.width() - icon_size - padding, screen.height() // 2 - total_height // 2, 0, 1)
+    }
+
+    return positions.get(location, positions["Top Right"])
+
+def overlay_positions(screen, location, icon_count, icon_size):
+    """Return the global position of every icon slot of a group on a screen."""
+    x_start, y_start, x_direction, y_direction = overlay_location(screen, location, icon_count, icon_size)
+    return [(screen.x() + x_start + i * x_direction * (icon_size + 5), screen.y() + y_start + i * y_direction * (icon_size + 5))
+            for i in range(max(icon_count, 1))]
+
+def profile_icons_dir(profile):
+    """Return the icon folder of a profile, icons/ for the default profile and icons/<profile>/ for the others."""
+    if profile == DEFAULT_PROFILE:
+        return ICONS_DIR
+    return os.path.join(ICONS_DIR, profile)
 
 def sanitize(filename):
     """Remove characters not allowed by file system and replace spaces with underscores."""
     return re.sub(r'[<>:"/\\|?*]', '', filename).strip(". ").replace(" ", "_")
 
-app = QApplication(sys.argv)
-overlay = IconOverlay()
-overlay.show()
-sys.exit(app.exec_())
\ No newline at end of file
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    overlay = IconOverlay()
+    overlay.show()
+    sys.exit(app.exec_())
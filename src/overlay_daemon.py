@@ -0,0 +1,309 @@
+import os, sys, hmac, signal, json, asyncio, hashlib, secrets, argparse, threading
+from multiprocessing import shared_memory, resource_tracker
+
+"""Initialize global variables"""
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = 0
+
+class AssetCache:
+    """Scale each distinct icon image once and pack it into shared memory read by every client.
+
+    Images are keyed by content hash and pixel size, so identical icons used by several of this
+    user's overlays in one login session share one copy. Each request that needs new images
+    gets one new segment holding them back to back as RGBA pixels; segments live until the
+    daemon stops.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self.lock = threading.Lock()
+        self.hashes = {}
+        self.assets = {}
+        self.segments = []
+        self.stats = {"scaled": 0, "reused": 0, "segments": 0, "bytes": 0}
+
+    def content_hash(self, path):
+        """Return the hash of an image file, rehashing only when its modification time changes."""
+        mtime = os.path.getmtime(path)
+        if path not in self.hashes or self.hashes[path][0] != mtime:
+            with open(path, "rb") as f:
+                self.hashes[path] = (mtime, hashlib.sha1(f.read()).hexdigest())
+        return self.hashes[path][1]
+
+    def request(self, paths, sizes):
+        """Return [path, size, segment, offset] for every image at every pixel size, scaling missing ones."""
+        with self.lock:
+            keys = {}
+            missing = {}
+            for path in paths:
+                try:
+                    digest = self.content_hash(path)
+                except OSError:
+                    continue
+                for size in sizes:
+                    key = (digest, size)
+                    keys[(path, size)] = key
+                    if key in self.assets:
+                        self.stats["reused"] += 1
+                    elif key not in missing:
+                        missing[key] = scale_image(path, size)
+
+            missing = {key: pixels for key, pixels in missing.items() if pixels}
+            if missing:
+                segment = shared_memory.SharedMemory(create=True, size=sum(len(pixels) for pixels in missing.values()))
+                self.segments.append(segment)
+                offset = 0
+                for key, pixels in missing.items():
+                    segment.buf[offset:offset + len(pixels)] = pixels
+                    self.assets[key] = (segment.name, offset)
+                    offset += len(pixels)
+                self.stats["scaled"] += len(missing)
+                self.stats["segments"] += 1
+                self.stats["bytes"] += offset
+
+            return [[path, size, *self.assets[key]] for (path, size), key in keys.items() if key in self.assets]
+
+    def close(self):
+        """Release every shared memory segment."""
+        for segment in self.segments:
+            segment.close()
+            segment.unlink()
+        self.segments = []
+
+class OverlayDaemon:
+    """Own one keyboard hook and the icon asset cache for every overlay client on this session.
+
+    The daemon listens on a port chosen at startup and writes the port and a random token to
+    an endpoint file only the current user can read. Clients connect over a local socket and
+    exchange newline delimited JSON messages: {"type": "hello", "token": ..., "combos": [...],
+    "icons": [paths], "sizes": [pixel sizes]} registers a client's combos and is answered with
+    {"type": "assets", "assets": [[path, size, segment, offset], ...]}, and {"type": "trigger",
+    "combo": ...} fires a combo as if it was pressed. A connection whose first message is not
+    a hello with the token is answered with {"type": "error"} and closed. The daemon sends
+    {"type": "combo", "combo": ...} to every client that registered a pressed combo. Icon
+    states and settings stay with each client.
+    """
+
+    def __init__(self, host=DAEMON_HOST, port=DAEMON_PORT, hooks=True, endpoint_file=None):
+        """Initialize the daemon without starting it."""
+        self.host = host
+        self.port = port
+        self.hooks = hooks
+        self.endpoint_file = endpoint_file or default_endpoint_file()
+        self.token = secrets.token_hex(16)
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.ready = threading.Event()
+        self.assets = AssetCache()
+        self.clients = {}
+        self.combos = {}
+        self.hotkey_handles = {}
+        self.last_combo = None
+        self.stats = {"hotkeys": 0, "deliveries": 0, "rejected": 0}
+
+    def start(self):
+        """Start the daemon thread and wait until it is listening."""
+        self.thread = threading.Thread(target=self.run, name="OverlayDaemon", daemon=True)
+        self.thread.start()
+        self.ready.wait(5)
+
+    def run(self):
+        """Run the event loop of the daemon thread."""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(asyncio.start_server(self.handle_client, self.host, self.port))
+            self.port = self.server.sockets[0].getsockname()[1]
+            write_endpoint(self.endpoint_file, self.port, self.token)
+        except OSError as e:
+            print(f"Error starting overlay daemon: {e}")
+            if self.server:
+                self.server.close()
+                self.server = None
+            self.ready.set()
+            return
+        if self.hooks:
+            import keyboard
+            keyboard.on_release(self.reset_last_combo)
+        self.ready.set()
+        self.loop.run_forever()
+        self.loop.close()
+        self.assets.close()
+        remove_endpoint(self.endpoint_file, self.token)
+
+    def stop(self):
+        """Disconnect every client and stop the daemon thread."""
+        if self.loop and self.loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.shutdown(), self.loop)
+            self.thread.join(5)
+
+    async def shutdown(self):
+        """Close the server and every client connection, then stop the loop."""
+        self.server.close()
+        for writer in list(self.clients):
+            writer.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        if tasks:
+            await asyncio.wait(tasks, timeout=1)
+        if self.hooks:
+            import keyboard
+            keyboard.unhook_all()
+        self.loop.stop()
+
+    async def handle_client(self, reader, writer):
+        """Serve one client until it disconnects, closing it unless it starts with a hello carrying the token."""
+        try:
+            while line := await reader.readline():
+                message = json.loads(line)
+                if writer not in self.clients:
+                    if message.get("type") != "hello" or not self.authorized(message.get("token")):
+                        self.stats["rejected"] += 1
+                        writer.write(json.dumps({"type": "error", "error": "Invalid daemon token"}).encode("utf-8") + b"\n")
+                        await writer.drain()
+                        break
+                    self.clients[writer] = set()
+                if message.get("type") == "hello":
+                    self.register(writer, message.get("combos", []))
+                    assets = await self.loop.run_in_executor(None, self.assets.request, message.get("icons", []), message.get("sizes", []))
+                    writer.write(json.dumps({"type": "assets", "assets": assets}).encode("utf-8") + b"\n")
+                    await writer.drain()
+                elif message.get("type") == "trigger":
+                    self.dispatch(message.get("combo"))
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            if writer in self.clients:
+                self.register(writer, [])
+                del self.clients[writer]
+            writer.close()
+
+    def authorized(self, token):
+        """Check a client's token against the daemon token in constant time."""
+        return isinstance(token, str) and hmac.compare_digest(token.encode("utf-8"), self.token.encode("utf-8"))
+
+    def register(self, writer, combos):
+        """Replace a client's combos, hooking combos no other client had registered."""
+        for combo in self.clients[writer] - set(combos):
+            self.combos[combo].discard(writer)
+            if not self.combos[combo]:
+                del self.combos[combo]
+                if combo in self.hotkey_handles:
+                    import keyboard
+                    keyboard.remove_hotkey(self.hotkey_handles.pop(combo))
+        for combo in set(combos) - self.clients[writer]:
+            if combo not in self.combos:
+                self.combos[combo] = set()
+                if self.hooks:
+                    import keyboard
+                    self.hotkey_handles[combo] = keyboard.add_hotkey(combo, self.check_hotkey, args=(combo,))
+            self.combos[combo].add(writer)
+        self.clients[writer] = set(combos)
+
+    def check_hotkey(self, combo):
+        """Forward a pressed combo once per press, called from the keyboard hook thread."""
+        import keyboard
+        current_combo = keyboard.get_hotkey_name().split("+")[-1]
+        if current_combo != self.last_combo:
+            self.last_combo = current_combo
+            self.loop.call_soon_threadsafe(self.dispatch, combo)
+
+    def reset_last_combo(self, event):
+        """Reset the last key combo."""
+        self.last_combo = None
+
+    def dispatch(self, combo):
+        """Send a combo to every client that registered it."""
+        writers = self.combos.get(combo)
+        if not writers:
+            return
+        message = json.dumps({"type": "combo", "combo": combo}).encode("utf-8") + b"\n"
+        for writer in writers:
+            writer.write(message)
+        self.stats["hotkeys"] += 1
+        self.stats["deliveries"] += len(writers)
+
+def scale_image(path, size):
+    """Return an image scaled to a square pixel size as RGBA bytes, or None if it cannot be read."""
+    from PIL import Image
+    try:
+        with Image.open(path) as image:
+            return image.convert("RGBA").resize((size, size), Image.LANCZOS).tobytes()
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        print(f"Error scaling {path}: {e}")
+        return None
+
+def endpoint_dir():
+    """Return the directory holding this user's endpoint files."""
+    if os.name == "nt":
+        return os.path.join(os.environ.get("LOCALAPPDATA") or os.path.expanduser("~"), "overlay_daemon")
+    return os.path.join(os.environ.get("XDG_RUNTIME_DIR") or os.path.expanduser("~"), ".overlay_daemon")
+
+def default_endpoint_file():
+    """Return the daemon endpoint file of this user's login session."""
+    if os.name == "nt":
+        import ctypes
+        session = ctypes.c_ulong()
+        ctypes.windll.kernel32.ProcessIdToSessionId(os.getpid(), ctypes.byref(session))
+        return os.path.join(endpoint_dir(), f"session_{session.value}.json")
+    return os.path.join(endpoint_dir(), "endpoint.json")
+
+def control_endpoint_file(data_dir="data"):
+    """Return the endpoint file of the control port of the overlay using a data directory."""
+    key = hashlib.sha1(os.path.abspath(data_dir).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(endpoint_dir(), f"control_{key}.json")
+
+def write_endpoint(path, port, token):
+    """Write a local server's port and token to a file only the current user can read."""
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    temp_path = path + ".tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    with os.fdopen(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "w") as f:
+        json.dump({"port": port, "token": token, "pid": os.getpid()}, f)
+    os.replace(temp_path, path)
+
+def read_endpoint(path=None):
+    """Return the port and token of this user's daemon or another endpoint, refusing files another user could have written."""
+    path = path or default_endpoint_file()
+    if os.name != "nt":
+        info = os.stat(path)
+        if info.st_uid != os.getuid() or info.st_mode & 0o077:
+            raise PermissionError(f"{path} must be owned by and only readable by the current user")
+    with open(path, "r") as f:
+        endpoint = json.load(f)
+    return int(endpoint["port"]), str(endpoint["token"])
+
+def remove_endpoint(path, token):
+    """Remove an endpoint file unless another server has replaced it."""
+    try:
+        if read_endpoint(path)[1] == token:
+            os.remove(path)
+    except (OSError, ValueError, KeyError):
+        pass
+
+def attach_segment(name):
+    """Open a daemon's shared memory segment without taking over its cleanup."""
+    segment = shared_memory.SharedMemory(name)
+    if os.name != "nt":
+        resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Share one keyboard hook and icon cache between overlays.")
+    parser.add_argument("--port", type=int, default=DAEMON_PORT, help="Port to listen on, 0 to pick a free one")
+    parser.add_argument("--endpoint", default=default_endpoint_file(), help="File to publish the port and token in")
+    parser.add_argument("--no-hooks", action="store_true", help="Only forward triggered combos")
+    args = parser.parse_args()
+
+    daemon = OverlayDaemon(port=args.port, hooks=not args.no_hooks, endpoint_file=args.endpoint)
+    daemon.start()
+    if not daemon.server:
+        sys.exit(1)
+    print(f"Overlay daemon listening on {DAEMON_HOST}:{daemon.port}, endpoint {args.endpoint}", flush=True)
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    try:
+        while daemon.thread.is_alive():
+            daemon.thread.join(0.5)
+    except KeyboardInterrupt:
+        daemon.stop()
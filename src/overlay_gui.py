@@ -1,12 +1,17 @@
-import os, time, re, subprocess, psutil, shutil, json, keyboard
+import os, sys, time, re, socket, subprocess, json
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from PIL import Image, ImageTk
-from idlelib.tooltip import Hovertip
+from hotkey_index import HotkeyIndex, capitalize_key, describe_conflict
 
 """Initialize global variables"""
-HOTKEYS_FILE = "data/hotkeys.json"
+DEFAULT_HOTKEYS_FILE = "data/hotkeys.json"
+HOTKEYS_FILE = DEFAULT_HOTKEYS_FILE
 SETTINGS_FILE = "data/overlay_settings.json"
+PROFILES_DIR = "data/profiles"
+DEFAULT_PROFILE = "Default"
+UPLOAD_IMAGE = "assets/Upload_Image.png"
+PLACEHOLDER_CACHE = "data/cache/Upload_Image_96.png"
+OVERLAY_QUIT_TIMEOUT = 3
 
 DEFAULT_SETTINGS = {
     "overlay_pid": None,
@@ -49,6 +54,7 @@ class HotkeyEntry(tk.Entry):
     def on_focus_in(self, event):
         """Start recording hotkeys on focus."""
         if not self.is_recording:
+            import keyboard
             self.is_recording = True
             current_text = self.get()
             if current_text == self.default_text:
@@ -70,6 +76,7 @@ class HotkeyEntry(tk.Entry):
         """Process key events and update the key combination."""
         if not self.is_recording:
             return
+        import keyboard
         
         capitalized_key = self.capitalize_key(event.name)
 
@@ -92,7 +99,7 @@ class HotkeyEntry(tk.Entry):
 
     def capitalize_key(self, key):
         """Capitalize the first letter of every word in a key."""
-        return ' '.join(word.capitalize() for word in key.split())
+        return capitalize_key(key)
 
     def update_display(self):
         """Update the Entry widget to display the current key combination."""
@@ -102,27 +109,46 @@ class HotkeyEntry(tk.Entry):
 
     def finish_recording(self):
         """Finish recording the key combination."""
+        import keyboard
         self.is_recording = False
         keyboard.unhook(self.check_hotkeys)
         if not self.get():
             self.insert(0, self.default_text)
         self.master.focus_set()
     
-class CustomTooltip(Hovertip):
+class CustomTooltip:
     """Create the tooltip when hovering over the Upload Image button."""
 
     def __init__(self, widget, text, hover_delay=1000, x_min=0, x_max=100, y_min=0, y_max=100):
         """Initialize the tooltip with boundaries constrained to the Upload Image button."""
-        super().__init__(widget, text, hover_delay)
         self.widget = widget
+        self.text = text
+        self.hover_delay = hover_delay
+        self.tipwindow = None
+        self.after_id = None
         self.BACKGROUND_COLOR = BACKGROUND_COLOR
         self.last_motion = 0
+        self.widget.bind("<Enter>", lambda event: self.schedule())
+        self.widget.bind("<Leave>", lambda event: self.hidetip())
+        self.widget.bind("<Button>", lambda event: self.hidetip())
         self.widget.bind("<Motion>", self.on_motion)
         self.x_min, self.x_max = x_min, x_max
         self.y_min, self.y_max = y_min, y_max
 
+    def schedule(self):
+        """Show the tooltip once the pointer has rested for the hover delay."""
+        self.unschedule()
+        self.after_id = self.widget.after(self.hover_delay, self.showtip)
+
+    def unschedule(self):
+        """Cancel a pending tooltip."""
+        if self.after_id:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
     def showtip(self):
         """Display the tooltip if conditions are met."""
+        self.after_id = None
         if time.time() - self.last_motion < 1:
             return
         if self.tipwindow:
@@ -147,17 +173,178 @@ class CustomTooltip(Hovertip):
     def on_motion(self, event):
         """Handle mouse motion events to control the tooltip."""
         self.last_motion = time.time()
-        if self.tipwindow:
-            self.tipwindow.destroy()
-            self.tipwindow = None
+        self.hidetip()
         self.schedule()
 
     def hidetip(self):
-        """Hide the tooltip."""
+        """Hide the tooltip and cancel any pending one."""
+        self.unschedule()
         if self.tipwindow:
             self.tipwindow.destroy()
             self.tipwindow = None
 
+class IconSelector(tk.Menubutton):
+    """Searchable icon dropdown that only renders the rows currently in view."""
+
+    def __init__(self, master, variable, names, visible_rows=10, **kwargs):
+        """Initialize the selector with the icon names to choose from."""
+        super().__init__(master, textvariable=variable, indicatoron=True, relief="raised", **kwargs)
+        self.variable = variable
+        self.names = list(names)
+        self.folded = {name: name.casefold() for name in self.names}
+        self.visible_rows = visible_rows
+        self.query = ""
+        self.matches = self.names
+        self.offset = 0
+        self.active = 0
+        self.popup = None
+        self.bind("<Button-1>", self.open)
+
+    def add(self, name):
+        """Add an icon name to the end of the list."""
+        if name not in self.folded:
+            self.names.append(name)
+            self.folded[name] = name.casefold()
+            self.refresh()
+
+    def rename(self, old_name, new_name):
+        """Rename an icon in place."""
+        if old_name not in self.folded:
+            return self.add(new_name)
+        self.names[self.names.index(old_name)] = new_name
+        del self.folded[old_name]
+        self.folded[new_name] = new_name.casefold()
+        self.refresh()
+
+    def set_names(self, names):
+        """Replace every icon name in the list."""
+        self.names = list(names)
+        self.folded = {name: name.casefold() for name in self.names}
+        self.refresh()
+
+    def remove(self, name):
+        """Remove an icon name from the list."""
+        if name in self.folded:
+            self.names.remove(name)
+            del self.folded[name]
+            self.refresh()
+
+    def build_popup(self):
+        """Create the popup window and its fixed pool of row labels."""
+        self.popup = tk.Toplevel(self)
+        self.popup.wm_overrideredirect(1)
+        self.popup.withdraw()
+
+        self.search_var = tk.StringVar(self.popup)
+        self.search_entry = tk.Entry(self.popup, textvariable=self.search_var)
+        self.search_entry.pack(fill=tk.X)
+        self.search_var.trace_add("write", lambda *args: self.filter(self.search_var.get()))
+
+        list_frame = tk.Frame(self.popup, relief=tk.SOLID, borderwidth=1)
+        list_frame.pack(fill=tk.BOTH, expand=True)
+        self.scrollbar = tk.Scrollbar(list_frame, command=self.on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.rows = []
+        for i in range(self.visible_rows):
+            row = tk.Label(list_frame, anchor="w", padx=4)
+            row.pack(fill=tk.X)
+            row.bind("<Button-1>", lambda event, i=i: self.select(self.offset + i))
+            row.bind("<MouseWheel>", self.on_mousewheel)
+            self.rows.append(row)
+
+        for sequence, handler in [("<Down>", lambda e: self.move(1)), ("<Up>", lambda e: self.move(-1)),
+                                  ("<Next>", lambda e: self.move(self.visible_rows)), ("<Prior>", lambda e: self.move(-self.visible_rows)),
+                                  ("<Return>", lambda e: self.select(self.active)), ("<Escape>", lambda e: self.close()),
+                                  ("<MouseWheel>", self.on_mousewheel), ("<FocusOut>", lambda e: self.close())]:
+            self.search_entry.bind(sequence, handler)
+
+    def open(self, event=None):
+        """Show the popup below the selector with an empty search."""
+        if str(self["state"]) == "disabled":
+            return "break"
+        if self.popup is None:
+            self.build_popup()
+        self.search_var.set("")
+        self.filter("")
+        self.popup.wm_geometry(f"{max(self.winfo_width(), 160)}x{(self.visible_rows + 1) * 21 + 4}+{self.winfo_rootx()}+{self.winfo_rooty() + self.winfo_height()}")
+        self.popup.deiconify()
+        self.popup.lift()
+        self.search_entry.focus_set()
+        return "break"
+
+    def close(self):
+        """Hide the popup."""
+        if self.popup is not None:
+            self.popup.withdraw()
+
+    def filter(self, query):
+        """Filter names by substring, narrowing the previous matches while typing ahead."""
+        folded_query = query.casefold()
+        candidates = self.matches if folded_query.startswith(self.query) else self.names
+        self.query = folded_query
+        self.matches = [name for name in candidates if folded_query in self.folded[name]] if folded_query else self.names
+        self.offset = 0
+        self.active = 0
+        self.render()
+
+    def refresh(self):
+        """Reapply the current filter after the names changed."""
+        self.query = ""
+        self.matches = self.names
+        if self.popup is not None and self.popup.winfo_viewable():
+            self.filter(self.search_var.get())
+
+    def render(self):
+        """Update the row labels for the rows in view."""
+        if self.popup is None:
+            return
+        for i, row in enumerate(self.rows):
+            index = self.offset + i
+            if index < len(self.matches):
+                active = index == self.active
+                row.config(text=self.matches[index], bg="#0078d7" if active else "white", fg="white" if active else "black")
+            else:
+                row.config(text="", bg="white")
+        total = max(len(self.matches), 1)
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.visible_rows) / total))
+
+    def scroll_to(self, offset):
+        """Scroll the list so that the given row is at the top."""
+        self.offset = max(0, min(offset, len(self.matches) - self.visible_rows))
+        self.render()
+
+    def move(self, step):
+        """Move the active row, scrolling it into view."""
+        if not self.matches:
+            return "break"
+        self.active = max(0, min(self.active + step, len(self.matches) - 1))
+        if self.active < self.offset:
+            self.offset = self.active
+        elif self.active >= self.offset + self.visible_rows:
+            self.offset = self.active - self.visible_rows + 1
+        self.render()
+        return "break"
+
+    def on_scrollbar(self, action, value, unit=None):
+        """Handle scrollbar drags and clicks."""
+        if action == "moveto":
+            self.scroll_to(int(float(value) * len(self.matches)))
+        elif action == "scroll":
+            self.scroll_to(self.offset + int(value) * (self.visible_rows if unit == "pages" else 1))
+
+    def on_mousewheel(self, event):
+        """Scroll the list with the mouse wheel."""
+        self.scroll_to(self.offset - (3 if event.delta > 0 else -3))
+        return "break"
+
+    def select(self, index):
+        """Select a matching name and close the popup."""
+        if 0 <= index < len(self.matches):
+            self.variable.set(self.matches[index])
+        self.close()
+        return "break"
+
 def load_overlay_settings():
     """Load overlay settings from overlay_settings.json."""
     global DEFAULT_SETTINGS
@@ -171,30 +358,74 @@ def load_overlay_settings():
                 settings[key] = value
         return settings
 
+def profile_hotkeys_file(profile):
+    """Return the hotkeys file of a profile, falling back to the default profile."""
+    path = os.path.join(PROFILES_DIR, f"{profile}.json")
+    if profile and profile != DEFAULT_PROFILE and os.path.exists(path):
+        return path
+    return DEFAULT_HOTKEYS_FILE
+
+def sync_active_profile():
+    """Follow the overlay's active profile, returning False if it switched since the icon list was loaded."""
+    global HOTKEYS_FILE
+    hotkeys_file = profile_hotkeys_file(load_overlay_settings().get("active_profile"))
+    if hotkeys_file == HOTKEYS_FILE:
+        return True
+
+    HOTKEYS_FILE = hotkeys_file
+    show_active_profile()
+    icon_menu.set_names(["New Icon"] + list(load_hotkeys().keys()))
+    icon_dropdown.set("New Icon")
+    messagebox.showinfo("Profile Switched", f'The overlay switched to the "{active_profile_name()}" profile. Your change was not saved; select the icon again to edit it in this profile.')
+    return False
+
+def active_profile_name():
+    """Return the name of the profile whose hotkeys file is being edited."""
+    if HOTKEYS_FILE == DEFAULT_HOTKEYS_FILE:
+        return DEFAULT_PROFILE
+    return os.path.splitext(os.path.basename(HOTKEYS_FILE))[0]
+
+def active_icons_dir():
+    """Return the icon folder of the profile being edited, icons/ for the default profile and icons/<profile>/ for the others."""
+    profile = active_profile_name()
+    if profile == DEFAULT_PROFILE:
+        return "icons"
+    return os.path.join("icons", profile)
+
+def active_icon_path(icon_name):
+    """Return the image file of an icon in the profile being edited, or None."""
+    icons_dir = active_icons_dir()
+    if os.path.isdir(icons_dir):
+        for file in os.listdir(icons_dir):
+            path = os.path.join(icons_dir, file)
+            if file.startswith(sanitize(icon_name) + ".") and os.path.isfile(path):
+                return path
+    return None
+
+def show_active_profile():
+    """Show the profile being edited in the window title."""
+    root.title(f"Microphone Status Overlay GUI - {active_profile_name()}")
+
 def save_overlay_settings(settings):
     """Save overlay settings to overlay_settings.json."""
     os.makedirs(os.path.dirname(SETTINGS_FILE), exist_ok=True)
     with open(SETTINGS_FILE, "w") as file:
         json.dump(settings, file, indent=4)
 
-def load_previous_process():
-    """Load and verify the previous overlay process."""
+def load_previous_process(settings):
+    """Load and verify the previous overlay process from already loaded settings, returning whether its ID is stale."""
     global overlay_pid
-    if overlay_is_running():
-        with open(SETTINGS_FILE, "r") as file:
-            data = json.load(file)
-        pid = data.get("overlay_pid")
-        if pid:
-            try:
-                overlay_pid = psutil.Process(pid)
-                if not overlay_pid.is_running() or overlay_pid.status() == psutil.STATUS_ZOMBIE:
-                    overlay_pid = None
-                    save_overlay_status(None)
-            except psutil.NoSuchProcess:
-                overlay_pid = None
-                save_overlay_status(None)
-    else:
-        overlay_pid = None
+    overlay_pid = None
+    pid = settings.get("overlay_pid")
+    if pid:
+        import psutil
+        try:
+            process = psutil.Process(pid)
+            if process.is_running() and process.status() != psutil.STATUS_ZOMBIE:
+                overlay_pid = process
+        except psutil.NoSuchProcess:
+            pass
+    return bool(pid) and overlay_pid is None
 
 def overlay_is_running():
     """Check if the overlay is running."""
@@ -203,6 +434,7 @@ def overlay_is_running():
             data = json.load(file)
         pid = data.get("overlay_pid")
         if pid is not None:
+            import psutil
             try:
                 process = psutil.Process(pid)
                 return process.is_running() and process.status() != psutil.STATUS_ZOMBIE
@@ -225,12 +457,20 @@ def save_overlay_status(pid=None):
     except IOError as e:
         messagebox.showerror("Error", f"Failed to save overlay status: {e}")
 
-def create_gui():
-    """Create and set up the GUI."""
+def placeholder_image():
+    """Return the Upload Image placeholder, resizing the asset only when it has changed."""
+    if not os.path.exists(PLACEHOLDER_CACHE) or os.path.getmtime(PLACEHOLDER_CACHE) < os.path.getmtime(UPLOAD_IMAGE):
+        from PIL import Image
+        os.makedirs(os.path.dirname(PLACEHOLDER_CACHE), exist_ok=True)
+        Image.open(UPLOAD_IMAGE).resize((96, 96), Image.LANCZOS).save(PLACEHOLDER_CACHE)
+    return tk.PhotoImage(file=PLACEHOLDER_CACHE)
+
+def create_gui(settings):
+    """Create and set up the GUI from already loaded settings."""
     global root, frame, entry_new_name, entry_hotkey, upload_button, add_apply_button, start_stop_button, icon_dropdown, icon_menu, delete_button, toggle_button, icon_size_var, upload_photo
 
     root = tk.Tk()
-    root.title("Microphone Status Overlay GUI")
+    show_active_profile()
     root.geometry("393x280")
     root.resizable(False, False)
     root.configure(bg=BACKGROUND_COLOR)
@@ -244,8 +484,7 @@ def create_gui():
     icon_names = ["New Icon"] + list(load_hotkeys().keys())
     icon_dropdown.set(icon_names[0])
     
-    icon_menu = tk.OptionMenu(frame, icon_dropdown, *icon_names)
-    icon_menu.config(width=12)
+    icon_menu = IconSelector(frame, icon_dropdown, icon_names, width=12)
     icon_menu.grid(row=0, column=1, padx=(3, 5), pady=5, sticky="ew")
 
     delete_button = tk.Button(frame, text="Delete", command=toggle_delete_confirm, width=7)
@@ -262,15 +501,14 @@ def create_gui():
 
     tk.Label(frame, text="Location:").grid(row=3, column=0, sticky="e", padx=(0, 5))
 
-    upload_icon_path = "assets/Upload_Image.png"
-    upload_photo = ImageTk.PhotoImage(Image.open(upload_icon_path).resize((96, 96), Image.LANCZOS))
-    
+    upload_photo = placeholder_image()
+
     upload_button = tk.Button(frame, image=upload_photo, command=upload_image, width=96, height=96)
     upload_button.image = upload_photo
     upload_button.grid(row=0, column=3, rowspan=3, padx=(10, 0), pady=5)
     CustomTooltip(upload_button, "Upload Image", hover_delay=1000, x_min=0, x_max=96, y_min=0, y_max=96)
 
-    create_location_buttons(frame)
+    create_location_buttons(frame, settings.get("overlay_location", "Top Right"))
 
     fake_image = tk.PhotoImage(width=1, height=1)
     toggle_button = tk.Button(frame, text="Toggle Icon", command=toggle_icon_state, image=fake_image, width=96, height=48, compound="c")
@@ -281,7 +519,7 @@ def create_gui():
     icon_size_frame.place(in_=frame, x=262, y=184)
 
     tk.Label(icon_size_frame, text="Icon Size:").pack(side=tk.LEFT)
-    icon_size_var = tk.IntVar(value=load_overlay_settings().get("icon_size", 44))
+    icon_size_var = tk.IntVar(value=settings.get("icon_size", 44))
     icon_size_spinbox = tk.Spinbox(icon_size_frame, from_=10, to=1000, width=3, textvariable=icon_size_var, command=update_icon_size, increment=5)
     icon_size_spinbox.pack(side=tk.LEFT)
 
@@ -305,11 +543,26 @@ def create_gui():
     add_apply_button.pack(side=tk.RIGHT, padx=(5, 5))
     start_stop_button.pack(side=tk.LEFT, padx=5)
 
+    more_button = tk.Menubutton(button_frame, text="More", relief="raised", width=5)
+    more_button.menu = tk.Menu(more_button, tearoff=0)
+    more_button.menu.config(postcommand=lambda: build_more_menu(more_button.menu))
+    more_button.config(menu=more_button.menu)
+    more_button.pack(side=tk.LEFT, padx=5)
+
     entry_new_name.bind("<KeyPress>", enable_add_apply_button)
     icon_size_spinbox.bind("<KeyRelease>", update_icon_size)
 
     return root
 
+def build_more_menu(menu):
+    """Fill the More menu the first time it is opened."""
+    if menu.index("end") is not None:
+        return
+    menu.add_command(label="Import Icon Pack Folder...", command=lambda: import_pack(filedialog.askdirectory()))
+    menu.add_command(label="Import Icon Pack Zip...", command=lambda: import_pack(filedialog.askopenfilename(filetypes=[("Zip Files", "*.zip")])))
+    menu.add_separator()
+    menu.add_command(label="Toggle History...", command=show_history)
+
 def load_hotkeys():
     """Load hotkeys from hotkeys.json or initialize System Mute hotkey."""
     try:
@@ -343,6 +596,7 @@ def upload_image():
     global previous_image_path
     file_path = filedialog.askopenfilename(filetypes=[("Image Files", "*.png;*.jpg;*.jpeg")])
     if file_path:
+        from PIL import Image, ImageTk
         img = Image.open(file_path).resize((96, 96), Image.LANCZOS)
         img_tk = ImageTk.PhotoImage(img)
         upload_button.config(image=img_tk, text="", width=96, height=96)
@@ -350,7 +604,7 @@ def upload_image():
         previous_image_path = file_path
     enable_add_apply_button()
 
-def create_location_buttons(frame):
+def create_location_buttons(frame, current_location):
     """Create buttons for choosing overlay location."""
     global location_frame
     location_frame = tk.Frame(frame)
@@ -362,9 +616,6 @@ def create_location_buttons(frame):
         "Bottom Left", "Bottom Middle", "Bottom Right"
     ]
 
-    settings = load_overlay_settings()
-    current_location = settings.get("overlay_location", "Top Right")
-
     button_width = 7
     button_height = 1
     for i, loc in enumerate(locations):
@@ -431,7 +682,7 @@ def start_stop_overlay():
     if overlay_is_running():
         if overlay_pid:
             try:
-                overlay_pid.terminate()
+                stop_overlay()
                 overlay_pid = None
                 save_overlay_status(None)
             except Exception as e:
@@ -440,9 +691,7 @@ def start_stop_overlay():
             messagebox.showerror("Error", "Overlay process handle is missing.")
     else:
         try:
-            overlay_pid = subprocess.Popen(["pythonw", "src/overlay.py"], 
-                             creationflags=subprocess.CREATE_NO_WINDOW,
-                             start_new_session=True)
+            overlay_pid = launch_overlay()
             save_overlay_status(overlay_pid.pid)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to start overlay: {e}")
@@ -478,7 +727,7 @@ def update_icon_size(event=None):
 
 def delete_icon(icon_name):
     """Delete the selected icon."""
-    if icon_name == "New Icon" or icon_name == "System Mute":
+    if icon_name == "New Icon" or icon_name == "System Mute" or not sync_active_profile():
         return
 
     try:
@@ -488,16 +737,12 @@ def delete_icon(icon_name):
             with open(HOTKEYS_FILE, "w") as f:
                 json.dump(hotkeys, f, indent=4)
 
-        for file in os.listdir("icons"):
-            if file.startswith(sanitize(icon_name) + "."):
-                os.remove(os.path.join("icons", file))
-                break
+        icon_path = active_icon_path(icon_name)
+        if icon_path:
+            os.remove(icon_path)
 
-        icon_names = ["New Icon"] + list(hotkeys.keys())
         icon_dropdown.set("New Icon")
-        icon_menu["menu"].delete(0, "end")
-        for name in icon_names:
-            icon_menu["menu"].add_command(label=name, command=tk._setit(icon_dropdown, name, load_icon_data))
+        icon_menu.remove(icon_name)
 
         reset_delete_button_state()
         load_icon_data("New Icon")
@@ -546,14 +791,11 @@ def load_icon_data(selection):
             entry_hotkey.delete(0, tk.END)
             entry_hotkey.insert(0, " + ".join(hotkeys[selection][:-1]))
             
-            icon_path = None
-            for file in os.listdir("icons"):
-                if file.startswith(sanitize(selection) + "."):
-                    icon_path = os.path.join("icons", file)
-                    break
+            icon_path = active_icon_path(selection)
 
             if icon_path and os.path.exists(icon_path):
                 if icon_path != previous_image_path:
+                    from PIL import Image, ImageTk
                     img = Image.open(icon_path).resize((96, 96), Image.LANCZOS)
                     img_tk = ImageTk.PhotoImage(img)
                     upload_button.config(image=img_tk, text="", width=96, height=96)
@@ -571,8 +813,9 @@ def save_icon(OK):
     """Save icon and terminate GUI if OK button pressed."""
     global last_saved_state, previous_image_path, add_apply_button_enabled
 
-    if not validate_save():
+    if not sync_active_profile() or not validate_save():
         return
+    from icon_import import save_icon_image
 
     current_state = {
         "name": entry_new_name.get().strip(),
@@ -592,9 +835,10 @@ def save_icon(OK):
             old_image_path = last_saved_state["image"]
             
             if selected != "System Mute":
-                new_image_extension = os.path.splitext(current_state["image"])[1]
+                icons_dir = active_icons_dir()
+                os.makedirs(icons_dir, exist_ok=True)
                 sanitized_name = sanitize(current_state["name"])
-                new_image_path = f"icons/{sanitized_name}{new_image_extension}"
+                new_image_path = os.path.join(icons_dir, f"{sanitized_name}.png")
 
                 image_changed = current_state["image"] != old_image_path
 
@@ -603,17 +847,18 @@ def save_icon(OK):
                         if image_changed:
                             if os.path.exists(old_image_path):
                                 os.remove(old_image_path)
-                            shutil.copy(current_state["image"], new_image_path)
+                            save_icon_image(current_state["image"], new_image_path)
                         else:
+                            new_image_path = os.path.join(icons_dir, f"{sanitized_name}{os.path.splitext(old_image_path)[1]}")
                             os.rename(old_image_path, new_image_path)
                     else:
                         if image_changed:
                             os.remove(old_image_path)
-                            shutil.copy(current_state["image"], new_image_path)
+                            save_icon_image(current_state["image"], new_image_path)
                         else:
                             new_image_path = old_image_path
                 else:
-                    shutil.copy(current_state["image"], new_image_path)
+                    save_icon_image(current_state["image"], new_image_path)
             else:
                 new_image_path = None
 
@@ -631,12 +876,11 @@ def save_icon(OK):
             update_icon_size()
 
             if add_apply_button_enabled:
-                hotkeys = load_hotkeys()
-                icon_names = ["New Icon"] + list(hotkeys.keys())
+                if old_name:
+                    icon_menu.rename(old_name, current_state["name"])
+                else:
+                    icon_menu.add(current_state["name"])
                 icon_dropdown.set(current_state["name"])
-                icon_menu["menu"].delete(0, "end")
-                for name in icon_names:
-                    icon_menu["menu"].add_command(label=name, command=tk._setit(icon_dropdown, name, load_icon_data))
 
                 restart_overlay()
 
@@ -649,9 +893,67 @@ def save_icon(OK):
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save icon: {str(e)}")
 
-def update_start_stop_button():
+def import_pack(source):
+    """Import an icon pack and add its icons to the dropdown."""
+    if not source or not sync_active_profile():
+        return
+    from icon_import import import_icon_pack, IconImportError
+    root.config(cursor="watch")
+    root.update_idletasks()
+    try:
+        result = import_icon_pack(source, hotkeys_file=HOTKEYS_FILE, icons_dir=active_icons_dir())
+    except IconImportError as e:
+        messagebox.showerror("Error", f"Failed to import icon pack:\n{e}")
+        return
+    except Exception as e:
+        messagebox.showerror("Error", f"Failed to import icon pack: {str(e)}")
+        return
+    finally:
+        root.config(cursor="")
+
+    for name in result["icons"]:
+        icon_menu.add(name)
+    restart_overlay()
+    messagebox.showinfo("Import Icon Pack", f"Imported {len(result['icons'])} icons ({result['images_per_second']:.1f} images/s).")
+
+def show_history():
+    """Show how long each icon was muted over a chosen period."""
+    from toggle_history import muted_time
+    periods = {"Last 24 Hours": 1, "Last 7 Days": 7, "Last 30 Days": 30, "Last 365 Days": 365}
+
+    window = tk.Toplevel(root)
+    window.title("Toggle History")
+    window.resizable(False, False)
+    window.configure(bg=BACKGROUND_COLOR)
+
+    period_var = tk.StringVar(window, "Last 24 Hours")
+    tk.OptionMenu(window, period_var, *periods).grid(row=0, column=0, columnspan=3, padx=10, pady=(10, 5), sticky="w")
+    table = tk.Frame(window, bg=BACKGROUND_COLOR)
+    table.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="w")
+
+    def refresh(*args):
+        for child in table.winfo_children():
+            child.destroy()
+        end = time.time_ns()
+        summary = muted_time(end - periods[period_var.get()] * 86400 * 10**9, end)
+        for column, heading in enumerate(["Icon", "Muted", "Toggles"]):
+            tk.Label(table, text=heading, font=("TkDefaultFont", 9, "bold"), bg=BACKGROUND_COLOR).grid(row=0, column=column, padx=5, sticky="w")
+        if not summary:
+            tk.Label(table, text="No history for this period.", bg=BACKGROUND_COLOR).grid(row=1, column=0, columnspan=3, padx=5, sticky="w")
+        for row, (icon_name, (seconds, toggles)) in enumerate(sorted(summary.items()), start=1):
+            hours, remainder = divmod(int(seconds), 3600)
+            tk.Label(table, text=icon_name, bg=BACKGROUND_COLOR).grid(row=row, column=0, padx=5, sticky="w")
+            tk.Label(table, text=f"{hours}:{remainder // 60:02d}:{remainder % 60:02d}", bg=BACKGROUND_COLOR).grid(row=row, column=1, padx=5, sticky="e")
+            tk.Label(table, text=str(toggles), bg=BACKGROUND_COLOR).grid(row=row, column=2, padx=5, sticky="e")
+
+    period_var.trace_add("write", refresh)
+    refresh()
+
+def update_start_stop_button(running=None):
     """Update the Start/Stop button text to match current overlay process state."""
-    start_stop_button.config(text="Stop Overlay" if overlay_is_running() else "Start Overlay")
+    if running is None:
+        running = overlay_is_running()
+    start_stop_button.config(text="Stop Overlay" if running else "Start Overlay")
 
 def restart_overlay():
     """Restart the overlay."""
@@ -659,15 +961,37 @@ def restart_overlay():
     if overlay_is_running():
         try:
             if overlay_pid:
-                overlay_pid.terminate()
-                overlay_pid.wait()
-            overlay_pid = subprocess.Popen(["pythonw", "src/overlay.py"], 
-                             creationflags=subprocess.CREATE_NO_WINDOW,
-                             start_new_session=True)
+                stop_overlay()
+            overlay_pid = launch_overlay()
             save_overlay_status(overlay_pid.pid)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to restart overlay: {e}")
 
+def launch_overlay():
+    """Start the overlay process without a console window."""
+    return subprocess.Popen(["pythonw", "src/overlay.py"], 
+                     creationflags=subprocess.CREATE_NO_WINDOW,
+                     start_new_session=True)
+
+def stop_overlay():
+    """Ask the overlay to quit through its control port so it can flush its history, terminating it if it does not."""
+    import psutil
+    from overlay_daemon import read_endpoint, control_endpoint_file
+    try:
+        port, token = read_endpoint(control_endpoint_file())
+        with socket.create_connection(("127.0.0.1", port), timeout=OVERLAY_QUIT_TIMEOUT) as connection:
+            reply = connection.makefile("rb")
+            connection.sendall(f"auth {token}\n".encode("utf-8"))
+            status, _, pid = reply.readline().decode("utf-8").strip().partition(" ")
+            if status != "ok" or overlay_pid.pid not in (int(pid), psutil.Process(int(pid)).ppid()):
+                raise OSError(f"control port is not served by overlay process {overlay_pid.pid}")
+            connection.sendall(b"quit\n")
+            reply.readline()
+        overlay_pid.wait(OVERLAY_QUIT_TIMEOUT)
+    except (OSError, ValueError, KeyError, psutil.Error, subprocess.TimeoutExpired):
+        overlay_pid.terminate()
+        overlay_pid.wait()
+
 def sanitize(filename):
     """Remove characters not allowed by file system and replace spaces with underscores."""
     return re.sub(r'[<>:"/\\|?*]', '', filename).strip(". ").replace(" ", "_")
@@ -679,8 +1003,8 @@ def validate_save():
     hotkey_string = entry_hotkey.get_hotkey()
     error_message = ""
 
-    existing_hotkeys = load_hotkeys()
-    if any(trimmed_name.lower() == existing_name.lower() for existing_name in existing_hotkeys) and trimmed_name.lower() != last_saved_state["name"].lower():
+    hotkey_index = HotkeyIndex({k: v[:-1] for k, v in load_hotkeys().items()})
+    if hotkey_index.find_name(trimmed_name) and trimmed_name.casefold() != last_saved_state["name"].casefold():
         messagebox.showerror("Error", f'"{trimmed_name}" already exists. Please choose a different name.')
         return False
 
@@ -714,10 +1038,28 @@ def validate_save():
         messagebox.showerror("Error", "Please enter a valid number for the icon size.")
         return False
 
+    return validate_hotkey_conflicts(hotkey_index, trimmed_name, hotkey_string)
+
+def validate_hotkey_conflicts(hotkey_index, name, hotkey_string):
+    """Reject duplicate or reserved hotkeys and confirm shadowing ones."""
+    old_name = hotkey_index.find_name(last_saved_state["name"]) if last_saved_state["name"] else None
+    if old_name:
+        hotkey_index.remove(old_name)
+    conflicts = hotkey_index.conflicts(hotkey_string.split(" + "))
+    hotkey_index.add(name, hotkey_string.split(" + "))
+    messages = [describe_conflict(name, kind, other, hotkey_index.entries) for kind, other in conflicts]
+
+    if any(kind in ("duplicate", "reserved") for kind, other in conflicts):
+        messagebox.showerror("Error", "\n".join(messages))
+        return False
+    if conflicts:
+        return messagebox.askyesno("Hotkey Conflict", "\n".join(messages) + "\n\nSave anyway?")
     return True
 
 def toggle_icon_state():
     """Manually toggle the selected icon in the overlay."""
+    if not sync_active_profile():
+        return
     selected = icon_dropdown.get()
     hotkeys = load_hotkeys()
     if selected in hotkeys:
@@ -774,10 +1116,30 @@ def check_focus(event):
         reset_delete_button_state()
         root.unbind("<Button-1>")
 
-load_overlay_settings()
-load_previous_process()
-
-root = create_gui()
-load_icon_data("New Icon")
-update_start_stop_button()
-root.mainloop()
\ No newline at end of file
+def report_startup(timings):
+    """Print startup phase timings once the window is interactive, then close the GUI."""
+    root.update_idletasks()
+    timings["interactive"] = time.perf_counter()
+    phases = ["start", "config", "widgets", "interactive"]
+    report = {phase: round((timings[phase] - timings[previous]) * 1000, 2) for previous, phase in zip(phases, phases[1:])}
+    report["time"] = time.time()
+    print(json.dumps(report), flush=True)
+    root.destroy()
+
+if __name__ == "__main__":
+    timings = {"start": time.perf_counter()}
+    settings = load_overlay_settings()
+    HOTKEYS_FILE = profile_hotkeys_file(settings.get("active_profile"))
+    stale_pid = load_previous_process(settings)
+    timings["config"] = time.perf_counter()
+
+    root = create_gui(settings)
+    load_icon_data("New Icon")
+    update_start_stop_button(overlay_pid is not None)
+    timings["widgets"] = time.perf_counter()
+
+    if "--startup-report" in sys.argv:
+        root.after_idle(report_startup, timings)
+    if stale_pid:
+        root.after_idle(save_overlay_status, None)
+    root.mainloop()
@@ -0,0 +1,84 @@
+import time, threading
+import psutil
+from PyQt5.QtCore import QObject, pyqtSignal
+
+"""Initialize global variables"""
+PROCESS_SCAN_INTERVAL = 2.0
+
+class ProcessWatcher(QObject):
+    """Track whether named processes are running by diffing the process ID set on a background thread.
+
+    Each scan lists only process IDs and looks up the name of new IDs, caching it until the ID
+    disappears. A process that exits and whose ID is reused between two scans keeps the cached
+    name, which is why the scan interval should stay short compared with how often apps restart.
+    """
+
+    processes_changed = pyqtSignal(dict, bool)
+
+    def __init__(self, process_names, interval=PROCESS_SCAN_INTERVAL, parent=None):
+        """Initialize the watcher without starting it."""
+        super().__init__(parent)
+        self.interval = interval
+        self.names = {}
+        self.counts = dict.fromkeys({process_key(name) for name in process_names}, 0)
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.stats = {"scans": 0, "lookups": 0, "last_scan_ms": 0.0, "cpu_ms": 0.0}
+
+    def start(self):
+        """Start scanning on the watcher thread."""
+        self.thread = threading.Thread(target=self.run, name="ProcessWatcher", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the watcher thread."""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(5)
+
+    def run(self):
+        """Scan until stopped, emitting the first scan in full and later scans only when something changed."""
+        self.scan()
+        self.processes_changed.emit(self.running(), True)
+        while not self.stop_event.wait(self.interval):
+            changed = self.scan()
+            if changed:
+                self.processes_changed.emit(changed, False)
+
+    def running(self):
+        """Return whether each watched process is running."""
+        return {name: count > 0 for name, count in self.counts.items()}
+
+    def scan(self, pids=None):
+        """Diff the process IDs against the last scan and return watched names whose running state changed."""
+        start = time.perf_counter()
+        start_cpu = time.thread_time()
+        pids = set(psutil.pids()) if pids is None else pids
+        before = self.running()
+
+        for pid in self.names.keys() - pids:
+            name = self.names.pop(pid)
+            if name in self.counts:
+                self.counts[name] -= 1
+        for pid in pids - self.names.keys():
+            self.names[pid] = name = self.lookup(pid)
+            if name in self.counts:
+                self.counts[name] += 1
+
+        self.stats["scans"] += 1
+        self.stats["last_scan_ms"] = (time.perf_counter() - start) * 1000
+        self.stats["cpu_ms"] += (time.thread_time() - start_cpu) * 1000
+        return {name: running for name, running in self.running().items() if running != before[name]}
+
+    def lookup(self, pid):
+        """Return the comparable name of a process, or None if it cannot be read."""
+        self.stats["lookups"] += 1
+        try:
+            return process_key(psutil.Process(pid).name())
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+def process_key(name):
+    """Return a process name in a form that ignores case and a trailing .exe."""
+    name = name.casefold()
+    return name[:-4] if name.endswith(".exe") else name
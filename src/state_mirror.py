@@ -0,0 +1,175 @@
+import os, time, struct
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtNetwork import QUdpSocket, QHostAddress, QAbstractSocket
+
+"""Initialize global variables"""
+MIRROR_GROUP = "239.255.43.21"
+MIRROR_PORT = 48262
+COALESCE_INTERVAL = 5
+SNAPSHOT_INTERVAL = 2000
+MAX_DATAGRAM_SIZE = 1200
+
+MAGIC = b"MSO3"
+HEADER = struct.Struct("<4sBIIdH")
+ENTRY = struct.Struct("<BQI")
+DELTA, SNAPSHOT = 0, 1
+
+class StatePublisher(QObject):
+    """Broadcast icon state changes as coalesced UDP datagrams with periodic snapshots.
+
+    Every state is sent with a version of (change number, instance that made the change).
+    Publishing a change gives the icon a change number above both its last one and the
+    current time in milliseconds, so changes made after an overlay restarts with a new
+    instance still outrank the ones it made before. Snapshots repeat the version of the
+    change that produced each state, including states mirrored from others.
+    """
+
+    def __init__(self, snapshot_provider, group=MIRROR_GROUP, port=MIRROR_PORT, parent=None):
+        """Initialize the publisher with a callable returning every current icon state."""
+        super().__init__(parent)
+        self.snapshot_provider = snapshot_provider
+        self.address = QHostAddress(group)
+        self.port = port
+        self.instance = struct.unpack("<I", os.urandom(4))[0]
+        self.sequence = 0
+        self.versions = {}
+        self.pending = {}
+        self.stats = {"datagrams": 0, "states": 0, "bytes": 0}
+
+        self.socket = QUdpSocket(self)
+        self.socket.setSocketOption(QAbstractSocket.MulticastTtlOption, 1)
+
+        self.coalesce_timer = QTimer(self)
+        self.coalesce_timer.setSingleShot(True)
+        self.coalesce_timer.setInterval(COALESCE_INTERVAL)
+        self.coalesce_timer.timeout.connect(self.flush)
+
+        self.snapshot_timer = QTimer(self)
+        self.snapshot_timer.setInterval(SNAPSHOT_INTERVAL)
+        self.snapshot_timer.timeout.connect(self.send_snapshot)
+        self.snapshot_timer.start()
+
+    def publish(self, icon_states):
+        """Queue changed icon states, sending every change in a burst as one datagram."""
+        now = int(time.time() * 1000)
+        for icon_name in icon_states:
+            self.versions[icon_name] = (max(self.versions.get(icon_name, (0, 0))[0] + 1, now), self.instance)
+        self.pending.update(icon_states)
+        if not self.coalesce_timer.isActive():
+            self.coalesce_timer.start()
+
+    def flush(self):
+        """Send the queued states as a delta."""
+        if self.pending:
+            self.send(DELTA, self.pending)
+            self.pending = {}
+
+    def send_snapshot(self):
+        """Send every current state for subscribers that joined late or lost datagrams."""
+        self.send(SNAPSHOT, self.snapshot_provider())
+
+    def send(self, kind, icon_states):
+        """Encode states into as few datagrams as fit and send them."""
+        entries = []
+        size = HEADER.size
+        for icon_name, state in icon_states.items():
+            name = icon_name.encode("utf-8")[:255]
+            entry = bytes([len(name)]) + name + ENTRY.pack(bool(state), *self.versions.get(icon_name, (0, self.instance)))
+            if entries and size + len(entry) > MAX_DATAGRAM_SIZE:
+                self.send_datagram(kind, entries)
+                entries, size = [], HEADER.size
+            entries.append(entry)
+            size += len(entry)
+        self.send_datagram(kind, entries)
+
+    def send_datagram(self, kind, entries):
+        """Send one datagram with the next sequence number."""
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        datagram = HEADER.pack(MAGIC, kind, self.instance, self.sequence, time.time(), len(entries)) + b"".join(entries)
+        self.socket.writeDatagram(datagram, self.address, self.port)
+        self.stats["datagrams"] += 1
+        self.stats["states"] += len(entries)
+        self.stats["bytes"] += len(datagram)
+
+class StateSubscriber(QObject):
+    """Receive mirrored icon states, ignoring stale, duplicate and own datagrams and outdated states.
+
+    A state is only applied if its version is higher than the version of the icon's current
+    state. With a publisher in the same overlay, both share their versions, so a peer's
+    snapshot cannot revert a newer local change; icons nobody changed yet converge on the
+    state of the instance with the highest id.
+    """
+
+    states_received = pyqtSignal(dict, float)
+
+    def __init__(self, group=MIRROR_GROUP, port=MIRROR_PORT, publisher=None, parent=None):
+        """Initialize the subscriber and join the multicast group, sharing versions with the overlay's publisher if any."""
+        super().__init__(parent)
+        self.ignore_instance = publisher.instance if publisher else None
+        self.versions = publisher.versions if publisher else {}
+        self.default_version = (0, publisher.instance) if publisher else (-1, 0)
+        self.sequences = {}
+        self.stats = {"datagrams": 0, "stale": 0, "lost": 0, "invalid": 0, "outdated": 0}
+
+        self.socket = QUdpSocket(self)
+        address = QHostAddress(group)
+        bind_address = QHostAddress.AnyIPv4 if address.isMulticast() else address
+        if not self.socket.bind(bind_address, port, QUdpSocket.ShareAddress | QUdpSocket.ReuseAddressHint):
+            print(f"Error binding mirror subscriber: {self.socket.errorString()}")
+        if address.isMulticast() and not self.socket.joinMulticastGroup(address):
+            print(f"Error joining mirror group {group}: {self.socket.errorString()}")
+        self.socket.readyRead.connect(self.read_datagrams)
+
+    def read_datagrams(self):
+        """Decode pending datagrams and emit the states of every fresh one."""
+        while self.socket.hasPendingDatagrams():
+            datagram = bytes(self.socket.receiveDatagram().data())
+            self.stats["datagrams"] += 1
+            try:
+                kind, instance, sequence, sent_time, icon_states = decode_datagram(datagram)
+            except ValueError:
+                self.stats["invalid"] += 1
+                continue
+            if instance == self.ignore_instance:
+                continue
+
+            last_sequence = self.sequences.get(instance)
+            if last_sequence is not None:
+                gap = (sequence - last_sequence) & 0xFFFFFFFF
+                if gap == 0 or gap >= 0x80000000:
+                    self.stats["stale"] += 1
+                    continue
+                self.stats["lost"] += gap - 1
+            self.sequences[instance] = sequence
+
+            newer = {}
+            for icon_name, (state, version) in icon_states.items():
+                if version > self.versions.get(icon_name, self.default_version):
+                    self.versions[icon_name] = version
+                    newer[icon_name] = state
+                else:
+                    self.stats["outdated"] += 1
+            if newer:
+                self.states_received.emit(newer, sent_time)
+
+def decode_datagram(datagram):
+    """Return (kind, instance, sequence, sent time, {icon name: (state, version)}) from a datagram."""
+    if len(datagram) < HEADER.size:
+        raise ValueError("datagram too short")
+    magic, kind, instance, sequence, sent_time, count = HEADER.unpack_from(datagram)
+    if magic != MAGIC:
+        raise ValueError("not a mirror datagram")
+
+    icon_states = {}
+    offset = HEADER.size
+    for _ in range(count):
+        if offset >= len(datagram):
+            raise ValueError("truncated datagram")
+        length = datagram[offset]
+        end = offset + 1 + length
+        if end + ENTRY.size > len(datagram):
+            raise ValueError("truncated datagram")
+        state, change, origin = ENTRY.unpack_from(datagram, end)
+        icon_states[datagram[offset + 1:end].decode("utf-8", "replace")] = (bool(state), (change, origin))
+        offset = end + ENTRY.size
+    return kind, instance, sequence, sent_time, icon_states
@@ -0,0 +1,201 @@
+import json, time, asyncio, hashlib, threading
+from urllib.parse import unquote
+
+"""Initialize global variables"""
+FEED_HOST = "127.0.0.1"
+FEED_PORT = 48263
+KEEPALIVE_INTERVAL = 15
+SUBSCRIBER_BUFFER_SIZE = 64 * 1024
+
+class StatusFeed:
+    """Serve icon metadata, icon images and a Server-Sent Events stream from an asyncio thread."""
+
+    def __init__(self, host=FEED_HOST, port=FEED_PORT, allow_origin=None):
+        """Initialize the feed without starting it, letting web pages from allow_origin read it if set."""
+        self.host = host
+        self.port = port
+        self.cors_header = f"Access-Control-Allow-Origin: {allow_origin}\r\n" if allow_origin else ""
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.ready = threading.Event()
+        self.metadata = b"{}"
+        self.icon_sets = {}
+        self.states = {}
+        self.images = {}
+        self.subscribers = {}
+        self.resyncing = set()
+        self.closing = False
+        self.stats = {"messages": 0, "deliveries": 0, "dropped": 0, "resyncs": 0, "last_fanout_ms": 0.0, "max_fanout_ms": 0.0}
+
+    def start(self):
+        """Start the server thread and wait until it is listening."""
+        self.thread = threading.Thread(target=self.run, name="StatusFeed", daemon=True)
+        self.thread.start()
+        self.ready.wait(5)
+
+    def run(self):
+        """Run the event loop of the server thread."""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(asyncio.start_server(self.handle_client, self.host, self.port))
+        except OSError as e:
+            print(f"Error starting status feed: {e}")
+            self.ready.set()
+            return
+        self.ready.set()
+        self.loop.run_forever()
+        self.loop.close()
+
+    def stop(self):
+        """Close every connection and stop the server thread."""
+        if self.loop and self.loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.shutdown(), self.loop)
+            self.thread.join(5)
+
+    async def shutdown(self):
+        """Close the server, end every event stream and stop the loop."""
+        self.server.close()
+        self.closing = True
+        for wakeup in self.subscribers.values():
+            wakeup.set()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        if tasks:
+            await asyncio.wait(tasks, timeout=1)
+        self.loop.stop()
+
+    def set_icon_sets(self, icon_sets, images):
+        """Encode the icon metadata of every icon set and hash the pre-scaled PNG images keyed by "<icon set>/<icon name>", before starting."""
+        self.icon_sets = {name: json.dumps({"icons": icons}, ensure_ascii=False).encode("utf-8") for name, icons in icon_sets.items()}
+        self.images = {name: (png, '"' + hashlib.sha1(png).hexdigest() + '"') for name, png in images.items()}
+
+    def activate(self, icon_set, icon_states):
+        """Make an encoded icon set and its states current, callable from any thread."""
+        if self.loop:
+            self.loop.call_soon_threadsafe(self.replace_icons, self.icon_sets[icon_set], dict(icon_states))
+        else:
+            self.replace_icons(self.icon_sets[icon_set], dict(icon_states))
+
+    def replace_icons(self, metadata, icon_states):
+        """Swap in new icons on the server thread and tell subscribers to reload them."""
+        self.metadata = metadata
+        self.states = icon_states
+        message = b"event: icons\ndata: " + metadata + b"\n\n"
+        for writer in self.subscribers:
+            self.send_event(writer, message)
+
+    def publish(self, icon_states):
+        """Fan changed icon states out to every subscriber, callable from any thread."""
+        if self.loop:
+            self.loop.call_soon_threadsafe(self.broadcast, dict(icon_states), time.perf_counter())
+        else:
+            self.states.update(icon_states)
+
+    def broadcast(self, icon_states, published):
+        """Serialize one event and write it to every subscriber."""
+        self.states.update(icon_states)
+        message = b"event: state\ndata: " + json.dumps(icon_states, ensure_ascii=False).encode("utf-8") + b"\n\n"
+        self.stats["messages"] += 1
+        for writer in self.subscribers:
+            self.send_event(writer, message)
+        self.stats["deliveries"] += len(self.subscribers)
+        fanout_ms = (time.perf_counter() - published) * 1000
+        self.stats["last_fanout_ms"] = fanout_ms
+        self.stats["max_fanout_ms"] = max(self.stats["max_fanout_ms"], fanout_ms)
+
+    def send_event(self, writer, message):
+        """Write an event to a subscriber's transport, switching it to a resync when it falls behind.
+
+        Events only carry what changed, so a subscriber that misses one would show wrong states.
+        Once more than SUBSCRIBER_BUFFER_SIZE bytes wait to be sent, later events are skipped
+        and the subscriber's stream is woken to send the current icons and states as soon as
+        its buffer has drained.
+        """
+        if writer in self.resyncing:
+            self.stats["dropped"] += 1
+        elif writer.transport.is_closing():
+            self.subscribers[writer].set()
+        elif writer.transport.get_write_buffer_size() > SUBSCRIBER_BUFFER_SIZE:
+            self.stats["dropped"] += 1
+            self.stats["resyncs"] += 1
+            self.resyncing.add(writer)
+            self.subscribers[writer].set()
+        else:
+            writer.write(message)
+
+    async def handle_client(self, reader, writer):
+        """Serve one HTTP request."""
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+            request_line, *header_lines = request.decode("latin-1").split("\r\n")
+            method, path, _ = request_line.split(" ", 2)
+            headers = {name.strip().lower(): value.strip() for name, _, value in (line.partition(":") for line in header_lines if line)}
+            path = path.split("?", 1)[0]
+
+            if method != "GET":
+                await self.respond(writer, "405 Method Not Allowed", b"")
+            elif path == "/icons":
+                await self.respond(writer, "200 OK", self.metadata, "application/json")
+            elif path == "/state":
+                await self.respond(writer, "200 OK", json.dumps(self.states, ensure_ascii=False).encode("utf-8"), "application/json")
+            elif path == "/stats":
+                stats = dict(self.stats, subscribers=len(self.subscribers))
+                await self.respond(writer, "200 OK", json.dumps(stats).encode("utf-8"), "application/json")
+            elif path.startswith("/icons/"):
+                await self.serve_image(writer, path[len("/icons/"):], headers)
+            elif path == "/events":
+                await self.stream_events(writer)
+            else:
+                await self.respond(writer, "404 Not Found", b"")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, body, content_type="text/plain", extra_headers=""):
+        """Write a complete HTTP response."""
+        writer.write((f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+                      f"{self.cors_header}Connection: close\r\n{extra_headers}\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def serve_image(self, writer, name, headers):
+        """Serve a pre-scaled icon image, answering 304 when the ETag matches."""
+        name = unquote(name)
+        if name.endswith(".png"):
+            name = name[:-4]
+        if name not in self.images:
+            await self.respond(writer, "404 Not Found", b"")
+            return
+        png, etag = self.images[name]
+        cache_headers = f"ETag: {etag}\r\nCache-Control: no-cache\r\n"
+        if headers.get("if-none-match") == etag:
+            await self.respond(writer, "304 Not Modified", b"", "image/png", cache_headers)
+        else:
+            await self.respond(writer, "200 OK", png, "image/png", cache_headers)
+
+    async def stream_events(self, writer):
+        """Stream state changes to a subscriber until it disconnects, waking only for keepalives and resyncs."""
+        writer.transport.set_write_buffer_limits(SUBSCRIBER_BUFFER_SIZE)
+        writer.write((f"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                      f"{self.cors_header}Connection: keep-alive\r\n\r\n").encode("latin-1"))
+        writer.write(b"event: snapshot\ndata: " + json.dumps(self.states, ensure_ascii=False).encode("utf-8") + b"\n\n")
+        wakeup = asyncio.Event()
+        self.subscribers[writer] = wakeup
+        try:
+            await writer.drain()
+            while not self.closing and not writer.transport.is_closing():
+                try:
+                    await asyncio.wait_for(wakeup.wait(), KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    if writer not in self.resyncing:
+                        writer.write(b": keepalive\n\n")
+                wakeup.clear()
+                await writer.drain()
+                if writer in self.resyncing:
+                    self.resyncing.discard(writer)
+                    writer.write(b"event: icons\ndata: " + self.metadata + b"\n\n"
+                                 b"event: snapshot\ndata: " + json.dumps(self.states, ensure_ascii=False).encode("utf-8") + b"\n\n")
+        finally:
+            del self.subscribers[writer]
+            self.resyncing.discard(writer)
@@ -0,0 +1,190 @@
+import os, sys, json, mmap, time, struct, bisect
+
+"""Initialize global variables"""
+HISTORY_DIR = "data/history"
+SEGMENT_PREFIX = "toggles-"
+SEGMENT_SIZE = 4 * 1024 * 1024
+INDEX_INTERVAL = 1024
+
+RECORD = struct.Struct("<qHBB")
+INDEX_RECORD = struct.Struct("<qI")
+
+SOURCES = ["hotkey", "gui", "control", "mirror", "process", "snapshot", "stopped"]
+
+class ToggleHistory:
+    """Append toggle events to fixed-size binary records with a sparse time index.
+
+    Each segment file starts with a checkpoint, and a new checkpoint is written every
+    INDEX_INTERVAL records. A checkpoint is an index entry pointing at a snapshot of every
+    known icon state, so a query can start reading at the nearest checkpoint before it.
+    Timestamps are wall clock nanoseconds that never decrease within the log.
+    """
+
+    def __init__(self, directory=HISTORY_DIR):
+        """Open the newest segment for appending."""
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.icon_ids = load_icon_ids(directory)
+        self.icon_ids_changed = False
+        self.states = {}
+        self.pending = []
+        self.last_timestamp = 0
+        self.segment_number = 0
+        self.record_count = 0
+        self.next_checkpoint = 0
+
+        segments = list_segments(directory)
+        if segments:
+            self.segment_number = segments[-1][0]
+            log_path = segment_path(directory, self.segment_number)
+            size = os.path.getsize(log_path)
+            self.record_count = size // RECORD.size
+            if self.record_count:
+                with open(log_path, "rb") as f:
+                    f.seek((self.record_count - 1) * RECORD.size)
+                    self.last_timestamp = RECORD.unpack(f.read(RECORD.size))[0]
+            self.next_checkpoint = self.record_count
+        else:
+            self.segment_number = 1
+
+    def record(self, icon_name, state, source="hotkey", timestamp=None):
+        """Queue a state change to be written on the next flush."""
+        timestamp = max(timestamp or time.time_ns(), self.last_timestamp)
+        self.last_timestamp = timestamp
+        self.pending.append((timestamp, self.icon_id(icon_name), bool(state), SOURCES.index(source)))
+
+    def record_snapshot(self, icon_states, source="snapshot"):
+        """Queue the current state of several icons."""
+        for icon_name, state in icon_states.items():
+            self.record(icon_name, state, source)
+
+    def icon_id(self, icon_name):
+        """Return the numeric id of an icon name, assigning one to be saved on the next flush if needed."""
+        if icon_name not in self.icon_ids:
+            self.icon_ids[icon_name] = len(self.icon_ids)
+            self.icon_ids_changed = True
+        return self.icon_ids[icon_name]
+
+    def flush(self):
+        """Append all queued records, writing checkpoints and rotating segments as needed."""
+        if self.icon_ids_changed:
+            with open(os.path.join(self.directory, "icons.json"), "w", encoding="utf-8") as f:
+                json.dump(self.icon_ids, f, indent=4, ensure_ascii=False)
+            self.icon_ids_changed = False
+        if not self.pending:
+            return
+        log_data = bytearray()
+        index_data = bytearray()
+
+        for timestamp, icon_id, state, source in self.pending:
+            if (self.record_count + len(log_data) // RECORD.size + 1) * RECORD.size > SEGMENT_SIZE:
+                self.write_segment(log_data, index_data)
+                log_data, index_data = bytearray(), bytearray()
+                self.segment_number += 1
+                self.record_count = 0
+                self.next_checkpoint = 0
+
+            record_number = self.record_count + len(log_data) // RECORD.size
+            if record_number >= self.next_checkpoint:
+                index_data += INDEX_RECORD.pack(timestamp, record_number)
+                for snapshot_id, snapshot_state in self.states.items():
+                    log_data += RECORD.pack(timestamp, snapshot_id, snapshot_state, SOURCES.index("snapshot"))
+                self.next_checkpoint = record_number + len(self.states) + INDEX_INTERVAL
+            log_data += RECORD.pack(timestamp, icon_id, state, source)
+            self.states[icon_id] = state and source != SOURCES.index("stopped")
+
+        self.write_segment(log_data, index_data)
+        self.pending.clear()
+
+    def write_segment(self, log_data, index_data):
+        """Append record and index bytes to the current segment."""
+        with open(segment_path(self.directory, self.segment_number), "ab") as f:
+            f.write(log_data)
+        if index_data:
+            with open(segment_path(self.directory, self.segment_number, ".idx"), "ab") as f:
+                f.write(index_data)
+        self.record_count += len(log_data) // RECORD.size
+
+    def close(self):
+        """Mark every icon as stopped and flush the log."""
+        timestamp = max(time.time_ns(), self.last_timestamp)
+        for icon_id in set(self.states) | {record[1] for record in self.pending}:
+            self.pending.append((timestamp, icon_id, False, SOURCES.index("stopped")))
+        self.flush()
+
+def load_icon_ids(directory=HISTORY_DIR):
+    """Load the icon name to id mapping."""
+    try:
+        with open(os.path.join(directory, "icons.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def segment_path(directory, number, extension=".log"):
+    """Return the path of a segment file."""
+    return os.path.join(directory, f"{SEGMENT_PREFIX}{number:06d}{extension}")
+
+def list_segments(directory=HISTORY_DIR):
+    """Return (number, first timestamp) for every segment in order."""
+    segments = []
+    for file in os.listdir(directory) if os.path.isdir(directory) else []:
+        if file.startswith(SEGMENT_PREFIX) and file.endswith(".idx"):
+            number = int(file[len(SEGMENT_PREFIX):-4])
+            with open(os.path.join(directory, file), "rb") as f:
+                first_entry = f.read(INDEX_RECORD.size)
+            if len(first_entry) == INDEX_RECORD.size:
+                segments.append((number, INDEX_RECORD.unpack(first_entry)[0]))
+    return sorted(segments)
+
+def muted_time(start, end, directory=HISTORY_DIR):
+    """Return {icon name: (muted seconds, toggle count)} between two timestamps in nanoseconds."""
+    names = {icon_id: name for name, icon_id in load_icon_ids(directory).items()}
+    segments = list_segments(directory)
+    states = {}
+    muted = {}
+    toggles = {}
+
+    for i, (number, first_timestamp) in enumerate(segments):
+        next_first_timestamp = segments[i + 1][1] if i + 1 < len(segments) else None
+        if first_timestamp >= end or (next_first_timestamp is not None and next_first_timestamp <= start):
+            continue
+
+        with open(segment_path(directory, number, ".idx"), "rb") as f:
+            index = list(INDEX_RECORD.iter_unpack(f.read()))
+        checkpoint = bisect.bisect_right([timestamp for timestamp, record_number in index], start) - 1
+        first_record = index[max(checkpoint, 0)][1]
+
+        with open(segment_path(directory, number), "rb") as f:
+            size = os.path.getsize(f.name) // RECORD.size * RECORD.size
+            if size == 0:
+                continue
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data, memoryview(data) as view:
+                for timestamp, icon_id, state, source in RECORD.iter_unpack(view[first_record * RECORD.size:size]):
+                    if timestamp >= end:
+                        break
+                    previous_state, since = states.get(icon_id, (False, start))
+                    if previous_state and timestamp > start:
+                        muted[icon_id] = muted.get(icon_id, 0) + timestamp - max(since, start)
+                    if timestamp >= start and source < SOURCES.index("snapshot") and state != previous_state:
+                        toggles[icon_id] = toggles.get(icon_id, 0) + 1
+                    states[icon_id] = (bool(state) and source != SOURCES.index("stopped"), timestamp)
+
+        if next_first_timestamp is not None and next_first_timestamp >= end:
+            break
+
+    for icon_id, (state, since) in states.items():
+        if state and since < end:
+            muted[icon_id] = muted.get(icon_id, 0) + end - max(since, start)
+
+    return {names.get(icon_id, str(icon_id)): (muted.get(icon_id, 0) / 1e9, toggles.get(icon_id, 0))
+            for icon_id in set(muted) | set(toggles)}
+
+if __name__ == "__main__":
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 24
+    end = time.time_ns()
+    start_time = time.perf_counter()
+    summary = muted_time(end - int(hours * 3600e9), end)
+    elapsed = (time.perf_counter() - start_time) * 1000
+    for icon_name, (seconds, toggle_count) in sorted(summary.items()):
+        print(f"{icon_name:<30} {seconds / 3600:8.2f} h muted  {toggle_count:6d} toggles")
+    print(f"Queried the last {hours:g} hours in {elapsed:.1f} ms.")